@@ -133,7 +133,7 @@ class AttendanceManager:
         
         if clock_in_record:
             # Employee already clocked in, determine current shift based on role and clock-in time
-            clock_in_time = datetime.fromisoformat(clock_in_record['timestamp']).time()
+            clock_in_time = clock_in_record['_time_of_day']
             
             if employee_role == 'Security':
                 # Security: 7:00 AM - 7:00 PM, no clock-out time restrictions
@@ -191,7 +191,7 @@ class AttendanceManager:
                         # After grace period - mark as late
                         return self.REGULAR_SHIFT, 'clock', 'in_late'
     
-    def process_attendance(self, nric, method, attendance_mode, location_callback=None, is_late=False, shift_name=None, emergency_override=False):
+    def process_attendance(self, nric, method, attendance_mode, location_callback=None, is_late=False, shift_name=None, emergency_override=False, location_data=None):
         employee = self.db.get_employee(nric)
         if not employee:
             return False, f"Employee {nric} not found"
@@ -216,13 +216,13 @@ class AttendanceManager:
                 elif action == 'in_late':
                     return self.clock_in_employee(nric, method, shift, is_late=True)
                 elif action == 'out':
-                    return self.clock_out_employee(nric, method, shift, emergency_override=emergency_override)
+                    return self.clock_out_employee(nric, method, shift, emergency_override=emergency_override, location_data=location_data)
                 else:
                     return False, f"Clock mode not available - use CHECK mode during work hours"
             else:
                 # If emergency override is set, force clock out
                 if emergency_override:
-                    return self.clock_out_employee(nric, method, shift, emergency_override=True)
+                    return self.clock_out_employee(nric, method, shift, emergency_override=True, location_data=location_data)
                 # Fallback: treat as clock in
                 return self.clock_in_employee(nric, method, shift)
 
@@ -261,7 +261,7 @@ class AttendanceManager:
         else:
             return True, f"{employee['name']} ({employee_role}) clocked in for {shift['name']}"
     
-    def clock_out_employee(self, nric, method, shift, emergency_override=False):
+    def clock_out_employee(self, nric, method, shift, emergency_override=False, location_data=None):
         """Clock out employee for shift end with role-based time restrictions"""
         employee = self.db.get_employee(nric)
         employee_role = employee.get('role', 'Staff')
@@ -308,7 +308,7 @@ class AttendanceManager:
                         overtime_hours = self.calculate_overtime_hours(current_time_only, min_clock_out_time)
                         
                         # Record clock-out for previous day night shift
-                        record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, overtime_hours=overtime_hours)
+                        record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, location_data=location_data, overtime_hours=overtime_hours)
                         
                         base_message = f"{employee['name']} (Security) clocked out from Night Shift (7:00 PM - 7:00 AM)"
                         if overtime_hours > 0:
@@ -337,7 +337,7 @@ class AttendanceManager:
             if not clock_in_record:
                 return False, f"{employee['name']} (Security) hasn't clocked in today"
                 
-            clock_in_time = datetime.fromisoformat(clock_in_record['timestamp']).time()
+            clock_in_time = clock_in_record['_time_of_day']
             
             # Determine shift and minimum clock-out time
             if clock_in_time >= time(18, 0):  # Night shift (6:00 PM - 7:00 AM next day)
@@ -358,7 +358,7 @@ class AttendanceManager:
             overtime_hours = self.calculate_overtime_hours(current_time_only, min_clock_out_time)
             
             # Record clock-out with overtime information
-            record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, overtime_hours=overtime_hours)
+            record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, location_data=location_data, overtime_hours=overtime_hours)
             
             # Create clock out message with overtime if applicable
             if emergency_override:
@@ -373,7 +373,7 @@ class AttendanceManager:
             # Staff: Apply original time restrictions
             # Get clock-in time from the record
             from datetime import datetime
-            clock_in_time = datetime.fromisoformat(clock_in_record['timestamp']).time()
+            clock_in_time = clock_in_record['_time_of_day']
             
             # Determine shift type and appropriate minimum clock-out time
             if clock_in_time < time(8, 0):  # Clocked in before 8:00 AM = Early Shift
@@ -392,7 +392,7 @@ class AttendanceManager:
             overtime_hours = self.calculate_overtime_hours(current_time_only, min_clock_out_time)
             
             # Record clock-out with overtime information
-            record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, overtime_hours=overtime_hours)
+            record_id = self.db.record_attendance(nric, method, "out", "clock", current_time, location_data=location_data, overtime_hours=overtime_hours)
             
             # Create clock out message with overtime if applicable
             if emergency_override:
@@ -409,15 +409,10 @@ class AttendanceManager:
         employee = self.db.get_employee(nric)
         today_records = self.get_employee_attendance_today(nric)
         
-        # Find most recent CHECK record (ignore CLOCK records)
-        last_check_record = None
+        # Find most recent CHECK record (ignore CLOCK records) by highest ID (ID is auto-incrementing)
+        # Use the most recent CHECK record to determine toggle behavior
         check_records = [r for r in today_records if r.get('attendance_type') == 'check']
-        
-        if check_records:
-            # Sort by ID descending to get the most recent CHECK record (ID is auto-incrementing)
-            check_records.sort(key=lambda x: x.get('id', 0), reverse=True)
-            last_check_record = check_records[0]
-            # Use the most recent CHECK record to determine toggle behavior
+        last_check_record = max(check_records, key=lambda x: x.get('id', 0), default=None)
         
         current_time = self.get_current_time()
         
@@ -507,7 +502,11 @@ class AttendanceManager:
     def get_employee_attendance_today(self, nric):
         """Get today's attendance records for a specific employee"""
         all_today = self.db.get_attendance_today()
-        return [record for record in all_today if record['nric'] == nric]
+        records = [record for record in all_today if record['nric'] == nric]
+        # Parse the time of day once so the shift logic doesn't re-parse timestamps
+        for record in records:
+            record['_time_of_day'] = datetime.fromisoformat(record['timestamp']).time()
+        return records
 
     def get_attendance_summary_today(self):
         """Get summary of today's attendance"""
@@ -5,6 +5,8 @@ Provides high-performance face detection for attendance tracking
 import cv2
 import numpy as np
 from typing import List, Tuple, Optional, Dict, Any
+from operator import itemgetter
+from functools import lru_cache
 import time
 from datetime import datetime
 import hashlib
@@ -21,6 +23,48 @@ except ImportError:
     sys.path.append(str(Path(__file__).parent))
     from ultra_light_face_detector import UltraLightFaceDetector
 
+# Overlay colors (BGR): green for the best face, yellow for others
+_BEST_COLOR = (0, 255, 0)
+_OTHER_COLOR = (0, 255, 255)
+
+# Overlay geometry: fills label background rects (inclusive, like cv2.rectangle, and clipped
+# to the frame) and box colors from the face boxes and label sizes.
+# Compiled with Numba when it is installed, plain NumPy otherwise
+try:
+    import numba
+    
+    @numba.njit(cache=True)
+    def _compute_draw_geom(boxes, sizes, is_best, frame_w, frame_h, out_bg, out_colors):
+        for i in range(boxes.shape[0]):
+            x1 = boxes[i, 0]
+            y1 = boxes[i, 1]
+            out_bg[i, 0] = min(max(x1, 0), frame_w)
+            out_bg[i, 1] = min(max(y1 - sizes[i, 1] - 10, 0), frame_h)
+            out_bg[i, 2] = min(max(x1 + sizes[i, 0] + 1, 0), frame_w)
+            out_bg[i, 3] = min(max(y1 + 1, 0), frame_h)
+            color = _BEST_COLOR if is_best[i] else _OTHER_COLOR
+            for c in range(3):
+                out_colors[i, c] = color[c]
+    
+    NUMBA_AVAILABLE = True
+except ImportError:
+    def _compute_draw_geom(boxes, sizes, is_best, frame_w, frame_h, out_bg, out_colors):
+        out_bg[:, 0] = boxes[:, 0]
+        out_bg[:, 1] = boxes[:, 1] - sizes[:, 1] - 10
+        out_bg[:, 2] = boxes[:, 0] + sizes[:, 0] + 1
+        out_bg[:, 3] = boxes[:, 1] + 1
+        np.clip(out_bg[:, 0::2], 0, frame_w, out=out_bg[:, 0::2])
+        np.clip(out_bg[:, 1::2], 0, frame_h, out=out_bg[:, 1::2])
+        out_colors[:] = np.where(is_best[:, None], _BEST_COLOR, _OTHER_COLOR)
+    
+    NUMBA_AVAILABLE = False
+
+
+@lru_cache(maxsize=256)
+def _text_size(label, scale=0.6, thick=1):
+    """Cached cv2.getTextSize; overlay labels repeat across frames"""
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, scale, thick)[0]
+
 
 class AttendanceUltraLightDetector:
     """
@@ -158,8 +202,7 @@ class AttendanceUltraLightDetector:
             scored_faces.append((score, face))
         
         # Return the best scored face
-        scored_faces.sort(key=lambda x: x[0], reverse=True)
-        return scored_faces[0][1]
+        return max(scored_faces, key=itemgetter(0))[1]
     
     def _generate_face_id(self) -> str:
         """Generate a unique face ID for tracking"""
@@ -205,6 +248,39 @@ class AttendanceUltraLightDetector:
             print(f"[ATTENDANCE DETECTOR ERROR] Error saving face: {e}")
             return None
     
+    def _draw_all(self, result_frame: np.ndarray, faces: List[Dict[str, Any]],
+                  best_face: Optional[Dict[str, Any]] = None):
+        """Draw boxes, label backgrounds, labels and centers for all faces in one pass"""
+        if not faces:
+            return
+        
+        is_best = np.fromiter((bool(best_face) and face['id'] == best_face['id'] for face in faces),
+                              dtype=bool, count=len(faces))
+        boxes = np.array([face['bbox'] for face in faces], dtype=np.int32).reshape(-1, 4)
+        labels = [f"Face: {face['confidence']:.2f}" + (" [BEST]" if best else "")
+                  for face, best in zip(faces, is_best)]
+        sizes = np.array([_text_size(label) for label in labels], dtype=np.int32)
+        
+        frame_h, frame_w = result_frame.shape[:2]
+        bg = np.empty_like(boxes)
+        colors = np.empty((len(faces), 3), dtype=np.int32)
+        _compute_draw_geom(boxes, sizes, is_best, frame_w, frame_h, bg, colors)
+        colors = colors.tolist()
+        
+        # Outlines first so the label backgrounds sit on top, as before
+        for (x1, y1, x2, y2), color, best in zip(boxes.tolist(), colors, is_best.tolist()):
+            cv2.rectangle(result_frame, (x1, y1), (x2, y2), color, 3 if best else 2)
+        
+        # Label backgrounds
+        for (bx1, by1, bx2, by2), color in zip(bg.tolist(), colors):
+            result_frame[by1:by2, bx1:bx2] = color
+        
+        # Text and centers
+        for (x1, y1), color, label, face in zip(boxes[:, :2].tolist(), colors, labels, faces):
+            cv2.putText(result_frame, label, (x1, y1 - 5), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            cv2.circle(result_frame, face['center'], 3, color, -1)
+    
     def draw_attendance_overlay(self, frame: np.ndarray, faces: List[Dict[str, Any]], 
                               best_face: Optional[Dict[str, Any]] = None) -> np.ndarray:
         """
@@ -221,37 +297,7 @@ class AttendanceUltraLightDetector:
         result_frame = frame.copy()
         
         # Draw all detected faces
-        for face in faces:
-            x1, y1, x2, y2 = face['bbox']
-            confidence = face['confidence']
-            
-            # Color based on whether this is the best face
-            is_best = best_face and face['id'] == best_face['id']
-            color = (0, 255, 0) if is_best else (0, 255, 255)  # Green for best, yellow for others
-            thickness = 3 if is_best else 2
-            
-            # Draw bounding box
-            cv2.rectangle(result_frame, (x1, y1), (x2, y2), color, thickness)
-            
-            # Draw confidence and face info
-            label = f"Face: {confidence:.2f}"
-            if is_best:
-                label += " [BEST]"
-            
-            # Background for text
-            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)[0]
-            cv2.rectangle(result_frame, 
-                         (x1, y1 - label_size[1] - 10), 
-                         (x1 + label_size[0], y1), 
-                         color, -1)
-            
-            # Text
-            cv2.putText(result_frame, label, (x1, y1 - 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-            
-            # Draw face center
-            center = face['center']
-            cv2.circle(result_frame, center, 3, color, -1)
+        self._draw_all(result_frame, faces, best_face)
         
         # Draw performance stats
         fps = self.detector.get_fps()
@@ -13,6 +13,7 @@ import time
 import gc  # For garbage collection monitoring
 from queue import Queue, Empty
 from typing import Optional, Tuple, List
+from functools import lru_cache
 import tempfile
 from deepface import DeepFace
 from PIL import Image
@@ -25,12 +26,26 @@ import psutil  # For CPU monitoring
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=64)
+def _label_tile(label: str, color: Tuple[int, int, int]) -> np.ndarray:
+    """Render a face box label (black text on a filled box) once; later frames just copy it in"""
+    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+    # Same box as cv2.rectangle((x, y - 25), (x + w, y)), which includes both corners
+    tile = np.empty((26, label_size[0] + 1, 3), dtype=np.uint8)
+    tile[:] = color
+    cv2.putText(tile, label, (0, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+    tile.flags.writeable = False  # Shared by every frame
+    return tile
+
 class DeepFaceRecognitionSystem:
     
     def __init__(self, model_name='ArcFace', detector_backend='opencv'):
         self.model_name = model_name
         self.detector_backend = detector_backend
         self.known_faces = {}  
+        self._gallery = (None, {})  # (known_faces it was built from, stacked vectors per dimension)
+        self._batch_represent = None  # Whether DeepFace.represent takes a list of images (None until first tried)
         self.debug_distances = True  # Enable distance debugging
         
         # Initialize Haar Cascade for face detection
@@ -158,50 +173,60 @@ class DeepFaceRecognitionSystem:
                 except Exception as cleanup_e:
                     logger.warning(f"Failed to cleanup temp file {temp_path}: {cleanup_e}")
     
+    def _detect_face_crop(self, image_array: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int, int, int]]]:
+        """Haar-detect the largest face and return its padded crop with the original coordinates"""
+        if image_array is None or image_array.size == 0:
+            logger.debug("Empty or None image provided")
+            return None, None
+        
+        # Step 1: Use Haar Cascade for fast face detection with optimized parameters
+        gray = cv2.cvtColor(image_array, cv2.COLOR_BGR2GRAY)
+        
+        # Apply histogram equalization to improve detection in varying lighting
+        gray = cv2.equalizeHist(gray)
+        
+        faces = self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.15,       # Slightly larger steps for faster detection
+            minNeighbors=4,         # Reduced for faster processing with MobileFaceNet
+            minSize=(50, 50),       # Slightly smaller minimum for better detection
+            maxSize=(350, 350),     # Reduced maximum for faster processing
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+        
+        if len(faces) == 0:
+            logger.debug("No faces detected by Haar Cascade")
+            return None, None
+        
+        # Get the largest face (most prominent)
+        largest_face = max(faces, key=lambda face: face[2] * face[3])
+        x, y, w, h = largest_face
+        
+        logger.debug(f"Haar detected face at ({x}, {y}, {w}, {h})")
+        
+        # Step 2: Crop and preprocess the face region
+        # Reduced padding for faster processing with MobileFaceNet
+        padding = int(min(w, h) * 0.15)  # Reduced from 0.2 to 0.15
+        x_start = max(0, x - padding)
+        y_start = max(0, y - padding)
+        x_end = min(image_array.shape[1], x + w + padding)
+        y_end = min(image_array.shape[0], y + h + padding)
+        
+        face_crop = image_array[y_start:y_end, x_start:x_end]
+        
+        if face_crop.size == 0:
+            logger.debug("Face crop is empty")
+            return None, None
+        
+        return face_crop, (x, y, w, h)
+    
     def extract_face_embedding_hybrid(self, image_array: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int, int, int]]]:
         try:
-            if image_array is None or image_array.size == 0:
-                logger.debug("Empty or None image provided")
-                return None, None
-            
-            # Step 1: Use Haar Cascade for fast face detection with optimized parameters
-            gray = cv2.cvtColor(image_array, cv2.COLOR_BGR2GRAY)
-            
-            # Apply histogram equalization to improve detection in varying lighting
-            gray = cv2.equalizeHist(gray)
-            
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.15,       # Slightly larger steps for faster detection
-                minNeighbors=4,         # Reduced for faster processing with MobileFaceNet
-                minSize=(50, 50),       # Slightly smaller minimum for better detection
-                maxSize=(350, 350),     # Reduced maximum for faster processing
-                flags=cv2.CASCADE_SCALE_IMAGE
-            )
-            
-            if len(faces) == 0:
-                logger.debug("No faces detected by Haar Cascade")
-                return None, None
-            
-            # Get the largest face (most prominent)
-            largest_face = max(faces, key=lambda face: face[2] * face[3])
-            x, y, w, h = largest_face
-            
-            logger.debug(f"Haar detected face at ({x}, {y}, {w}, {h})")
-            
-            # Step 2: Crop and preprocess the face region
-            # Reduced padding for faster processing with MobileFaceNet
-            padding = int(min(w, h) * 0.15)  # Reduced from 0.2 to 0.15
-            x_start = max(0, x - padding)
-            y_start = max(0, y - padding)
-            x_end = min(image_array.shape[1], x + w + padding)
-            y_end = min(image_array.shape[0], y + h + padding)
-            
-            face_crop = image_array[y_start:y_end, x_start:x_end]
-            
-            if face_crop.size == 0:
-                logger.debug("Face crop is empty")
+            # Steps 1-2: Haar Cascade detection and padded crop
+            face_crop, face_box = self._detect_face_crop(image_array)
+            if face_crop is None:
                 return None, None
+            x, y, w, h = face_box
             
             # Step 3: Use DeepFace ArcFace to extract features from the cropped face
             temp_path = None
@@ -253,11 +278,86 @@ class DeepFaceRecognitionSystem:
             logger.exception(f"Hybrid face extraction failed: {e}")
             return None, None
     
+    def extract_face_embeddings_batch(self, images: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Extract one embedding per image (None where no face is found), without temp files.
+        
+        Faces are detected first and every crop is then embedded in a single model call.
+        """
+        embeddings = [None] * len(images)
+        start_time = time.time()
+        
+        crops = []
+        indices = []
+        for i, image_array in enumerate(images):
+            try:
+                face_crop, _ = self._detect_face_crop(image_array)
+                if face_crop is not None:
+                    crops.append(face_crop)
+                    indices.append(i)
+            except Exception as e:
+                logger.warning(f"Batch face detection failed for one image: {e}")
+        
+        for i, embedding in zip(indices, self._represent_crops(crops)):
+            embeddings[i] = embedding
+        
+        logger.debug(f"Batch extraction of {len(images)} images took {time.time() - start_time:.2f}s")
+        return embeddings
+    
+    def _represent_crops(self, crops: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Embed already-detected face crops, in one DeepFace call when the installed version supports it"""
+        if not crops:
+            return []
+        
+        # DeepFace accepts BGR arrays directly, so the crops never touch disk
+        if self._batch_represent is not False and len(crops) > 1:
+            try:
+                results = DeepFace.represent(
+                    img_path=crops,
+                    model_name=self.model_name,
+                    enforce_detection=False,  # We already detected with Haar
+                    detector_backend='skip'   # Skip DeepFace detection
+                )
+                # Batched calls return one result list per crop
+                if len(results) == len(crops) and all(isinstance(r, list) for r in results):
+                    self._batch_represent = True
+                    return [np.array(r[0]['embedding']) if r else None for r in results]
+                if self._batch_represent is None:
+                    logger.debug("Batched represent unsupported, embedding crops one at a time")
+                    self._batch_represent = False
+            except (TypeError, ValueError) as e:
+                # Versions without list input reject it on the first call; later failures are per call
+                if self._batch_represent is None:
+                    logger.debug(f"Batched represent unsupported, embedding crops one at a time: {e}")
+                    self._batch_represent = False
+                else:
+                    logger.warning(f"Batched represent failed, embedding crops one at a time: {e}")
+            except Exception as e:
+                logger.warning(f"Batched represent failed, embedding crops one at a time: {e}")
+        
+        embeddings = []
+        for face_crop in crops:
+            embedding = None
+            try:
+                results = DeepFace.represent(
+                    img_path=face_crop,
+                    model_name=self.model_name,
+                    enforce_detection=False,
+                    detector_backend='skip'
+                )
+                if results:
+                    embedding = np.array(results[0]['embedding'])
+            except Exception as e:
+                logger.warning(f"Batch face extraction failed for one image: {e}")
+            embeddings.append(embedding)
+        return embeddings
+    
     def load_known_faces(self, db_manager):
         try:
             # Load face vectors from database
             employees_with_vectors = db_manager.get_all_face_vectors()
-            self.known_faces.clear()
+            # Build into a fresh dict and swap it in at the end, so recognition running on
+            # another thread never iterates a dict that is being filled
+            known_faces = {}
             
             if employees_with_vectors:
                 face_count = 0
@@ -292,7 +392,7 @@ class DeepFaceRecognitionSystem:
                             if embeddings:
                                 # Also store the nric to be returned by recognize_face
                                 nric = employee.get('nric', username)
-                                self.known_faces[username] = {
+                                known_faces[username] = {
                                     'name': employee_name,
                                     'embeddings': embeddings,
                                     'nric': nric  # Store NRIC separately
@@ -315,12 +415,14 @@ class DeepFaceRecognitionSystem:
             else:
                 logger.warning("⚠️  No employees with face vectors found in database")
             
+            self.known_faces = known_faces
+            
         except Exception as e:
             logger.error(f"❌ Error loading known faces: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             # Clear known faces on error to prevent issues
-            self.known_faces.clear()
+            self.known_faces = {}
     
     def recognize_face(self, image_array: np.ndarray, confidence_threshold: float = None) -> Tuple[Optional[str], float]:
         try:
@@ -462,6 +564,80 @@ class DeepFaceRecognitionSystem:
             logger.error(f"Error recognizing face: {e}")
             return None, 0.0
     
+    def recognize_faces_batch(self, images: List[np.ndarray]) -> List[Tuple[Optional[str], float]]:
+        """Recognize several face images at once; returns (nric, confidence) per image.
+        
+        Embeddings are extracted in one pass and matched against every known vector with a
+        single matrix product, using the same acceptance rules as recognize_face.
+        """
+        results = [(None, 0.0)] * len(images)
+        try:
+            embeddings = self.extract_face_embeddings_batch(images)
+            
+            if not self.known_faces:
+                logger.warning("No known faces loaded")
+                return results
+            
+            known_faces, gallery = self._known_face_gallery()
+            for dim, (owners, vectors) in gallery.items():
+                indices = [i for i, embedding in enumerate(embeddings) if embedding is not None and len(embedding) == dim]
+                if not indices:
+                    continue
+                
+                # Cosine distance of every query to every known vector
+                queries = np.stack([embeddings[i] for i in indices]).astype(np.float32)
+                queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+                distances = 1.0 - queries @ vectors.T
+                best = distances.argmin(axis=1)
+                
+                for row, i in enumerate(indices):
+                    results[i] = self._accept_match(known_faces, owners[best[row]], float(distances[row, best[row]]))
+            
+            logger.debug(f"Batch recognition of {len(images)} faces: {sum(1 for nric, _ in results if nric)} recognized")
+        except Exception as e:
+            logger.error(f"Error recognizing face batch: {e}")
+        return results
+    
+    def _known_face_gallery(self):
+        """Normalized known face vectors stacked per dimension, rebuilt whenever known_faces is replaced"""
+        known_faces, gallery = self._gallery
+        if known_faces is self.known_faces:
+            return known_faces, gallery
+        
+        known_faces = self.known_faces
+        grouped = {}
+        for username, face_data in known_faces.items():
+            if isinstance(face_data, dict) and 'embeddings' in face_data:
+                vectors = face_data['embeddings']
+            elif isinstance(face_data, dict) and 'embedding' in face_data:
+                vectors = [face_data['embedding']]  # Legacy single embedding
+            else:
+                vectors = [face_data]  # Direct embedding
+            for vector in vectors:
+                vector = np.asarray(vector, dtype=np.float32)
+                owners, stacked = grouped.setdefault(len(vector), ([], []))
+                owners.append(username)
+                stacked.append(vector / np.linalg.norm(vector))
+        
+        gallery = {dim: (owners, np.stack(stacked)) for dim, (owners, stacked) in grouped.items()}
+        self._gallery = (known_faces, gallery)
+        return known_faces, gallery
+    
+    def _accept_match(self, known_faces, username: str, distance: float) -> Tuple[Optional[str], float]:
+        """Apply the recognize_face distance and confidence limits to a best match"""
+        confidence = max(0.0, 1.0 - distance)
+        if distance >= self.distance_threshold:
+            logger.info(f"Face match found but distance too high: {username}, distance: {distance:.3f}, threshold: {self.distance_threshold}")
+            return None, 0.0
+        if confidence < 0.65:
+            logger.info(f"Recognition confidence too low: {confidence:.2f} < 0.65 for {username}")
+            return None, 0.0
+        
+        face_data = known_faces[username]
+        nric = face_data.get('nric', username) if isinstance(face_data, dict) else username
+        logger.info(f"Face recognized: {nric} with distance {distance:.3f}, confidence {confidence:.2f}")
+        return nric, confidence
+    
     def _calculate_distance(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         try:
             if len(embedding1) != len(embedding2):
@@ -608,7 +784,11 @@ class DeepFaceRecognitionSystem:
             self.processing_thread.join(timeout=2.0)
         logger.info("Background face processing stopped")
     
-    def submit_frame_for_processing(self, frame: np.ndarray):
+    def submit_frame_for_processing(self, frame: np.ndarray, copy: bool = True):
+        """Queue a frame for background recognition.
+        
+        Pass copy=False to hand the frame over as-is when the caller will not modify it afterwards.
+        """
         if not self.processing_active:
             logger.debug("Processing not active, skipping frame submission")
             return
@@ -619,19 +799,17 @@ class DeepFaceRecognitionSystem:
         if (current_time - self.last_submission_time) >= self.submission_throttle:
             self.last_submission_time = current_time
             
-            # Check if queue is full and clear it if needed (prevent backlog)
-            if self.frame_queue.full():
+            # Drop any frame still waiting so only the newest is processed (prevent backlog)
+            while not self.frame_queue.empty():
                 try:
-                    # Remove old frame if queue is full
                     self.frame_queue.get_nowait()
                     logger.debug("Queue was full, removed old frame")
-                except:
-                    pass
+                except Empty:
+                    break
             
             try:
-                # Submit new frame (make a copy to prevent threading issues)
-                frame_copy = frame.copy()
-                self.frame_queue.put_nowait(frame_copy)
+                # Submit new frame (copied unless the caller hands it over, to prevent threading issues)
+                self.frame_queue.put_nowait(frame.copy() if copy else frame)
                 logger.debug("Frame submitted to processing queue")
             except Exception as e:
                 logger.debug(f"Failed to submit frame: {e}")
@@ -679,6 +857,13 @@ class DeepFaceRecognitionSystem:
                 # Wait for a frame with timeout to allow clean shutdown
                 frame = self.frame_queue.get(timeout=1.0)
                 
+                # If newer frames arrived meanwhile, process only the freshest one
+                while not self.frame_queue.empty():
+                    try:
+                        frame = self.frame_queue.get_nowait()
+                    except Empty:
+                        break
+                
                 logger.debug("[THREAD] Got frame, starting DeepFace processing...")
                 
                 # Perform face recognition with detailed logging
@@ -858,12 +1043,16 @@ class DeepFaceRecognitionSystem:
             logger.error(f"Error in hybrid frame processing: {e}")
             return []
     
-    def draw_face_boxes_from_results(self, image_array: np.ndarray, results: List[dict]) -> np.ndarray:
+    def draw_face_boxes_from_results(self, image_array: np.ndarray, results: List[dict], copy: bool = True) -> np.ndarray:
+        """Draw labelled face boxes; pass copy=False to draw onto image_array itself"""
+        result_image = image_array
         try:
             if image_array is None or image_array.size == 0:
                 return image_array
             
-            result_image = image_array.copy()
+            if copy:
+                result_image = image_array.copy()
+            image_height, image_width = result_image.shape[:2]
             
             for result in results:
                 if 'position' in result:
@@ -885,18 +1074,20 @@ class DeepFaceRecognitionSystem:
                     # Draw rectangle
                     cv2.rectangle(result_image, (x, y), (x + w, y + h), color, 2)
                     
-                    # Draw label background
-                    label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-                    cv2.rectangle(result_image, (x, y - 25), (x + label_size[0], y), color, -1)
-                    
-                    # Draw label text
-                    cv2.putText(result_image, label, (x, y - 5), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+                    # Draw label background and text from the cached tile, clipped to the image
+                    tile = _label_tile(label, color)
+                    tile_top = y - 25
+                    x0, y0 = max(x, 0), max(tile_top, 0)
+                    x1 = min(x + tile.shape[1], image_width)
+                    y1 = min(tile_top + tile.shape[0], image_height)
+                    if x1 > x0 and y1 > y0:
+                        result_image[y0:y1, x0:x1] = tile[y0 - tile_top:y1 - tile_top, x0 - x:x1 - x]
             
             return result_image
             
         except Exception as e:
             logger.error(f"Error drawing face boxes: {e}")
+            return result_image
     def get_face_detection_info(self) -> dict:
         """Get information about the face detection system"""
         return {
@@ -968,6 +1159,14 @@ class CameraManager:
         self.cap = None
         self.is_active = False
         
+        # Frames are read on a capture thread so a blocking cap.read() never stalls the caller;
+        # only the newest frame is kept
+        self._capture_thread = None
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._frame_lock)
+        self._latest_frame = None
+        self.capture_failed = False  # Last read on the capture thread failed
+        
     def start_camera(self):
         """Start camera capture"""
         try:
@@ -990,6 +1189,10 @@ class CameraManager:
                     pass  # Ignore if not supported
                 
                 self.is_active = True
+                self._latest_frame = None
+                self.capture_failed = False
+                self._capture_thread = threading.Thread(target=self._capture_loop, args=(self.cap,), daemon=True)
+                self._capture_thread.start()
                 logger.info("✅ Camera started successfully")
                 return True
             else:
@@ -1003,19 +1206,47 @@ class CameraManager:
     def stop_camera(self):
         """Stop camera capture"""
         try:
+            self.is_active = False
+            # Let the capture thread finish its current read before the device is released
+            if self._capture_thread is not None:
+                self._capture_thread.join(timeout=1.0)
+                self._capture_thread = None
             if self.cap:
                 self.cap.release()
                 self.cap = None
-            self.is_active = False
+            self._latest_frame = None
             logger.info("📷 Camera stopped")
             
         except Exception as e:
             logger.error(f"Error stopping camera: {e}")
     
-    def read_frame(self):
-        """Read frame from camera"""
-        if self.cap and self.is_active:
-            ret, frame = self.cap.read()
-            if ret:
-                return frame
-        return None
+    def _capture_loop(self, cap):
+        """Read frames continuously, keeping only the newest one (runs on the capture thread)"""
+        while self.is_active and self.cap is cap:
+            ret, frame = cap.read()
+            with self._frame_ready:
+                if ret:
+                    self._latest_frame = frame
+                    self.capture_failed = False
+                    self._frame_ready.notify_all()
+                else:
+                    self.capture_failed = True
+            if not ret:
+                time.sleep(0.03)  # Don't spin on a failing device
+    
+    def read_latest_frame(self):
+        """Return the newest frame not returned before, or None right away if there is none yet
+        (check capture_failed to tell a failing camera from one that is just between frames)"""
+        with self._frame_lock:
+            frame, self._latest_frame = self._latest_frame, None
+        return frame
+    
+    def read_frame(self, timeout=0.5):
+        """Read frame from camera, waiting for the next one from the capture thread"""
+        if not (self.cap and self.is_active):
+            return None
+        with self._frame_ready:
+            if self._latest_frame is None:
+                self._frame_ready.wait(timeout)
+            frame, self._latest_frame = self._latest_frame, None
+        return frame
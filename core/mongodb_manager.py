@@ -1,4 +1,5 @@
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 from datetime import datetime
 import os
 import numpy as np
@@ -211,7 +212,7 @@ class MongoDBManager:
             return []
     
     def record_attendance(self, nric, method, status="in", attendance_type="check", timestamp=None, location_data=None, late=False, overtime_hours=0):
-        """Record attendance for an employee with optional location data for CHECK OUT, late flag, and overtime hours"""
+        """Record attendance for an employee with optional location data for CHECK OUT / emergency CLOCK OUT, late flag, and overtime hours"""
         try:
             # Ensure connection is alive
             if not self.ensure_connection():
@@ -230,7 +231,8 @@ class MongoDBManager:
                 "overtime_hours": overtime_hours
             }
             
-            if attendance_type == "check" and status == "out" and location_data:
+            is_emergency = bool(location_data and location_data.get("emergency_clockout"))
+            if status == "out" and location_data and (attendance_type == "check" or is_emergency):
                 attendance_doc.update({
                     "location_name": location_data.get("location_name", ""),
                     "address": location_data.get("address", "")
@@ -241,7 +243,13 @@ class MongoDBManager:
                     attendance_doc["type"] = location_data.get("type")
                     print(f"[MONGODB] Recording CHECK OUT type: {location_data.get('type')}")
                 
-                print(f"[MONGODB] Recording CHECK OUT with location: {location_data.get('location_name', 'Unknown')} - {location_data.get('address', '')}")
+                # Add emergency information if present
+                if is_emergency:
+                    attendance_doc["emergency_clockout"] = True
+                    attendance_doc["emergency_reason"] = location_data.get("emergency_reason", "")
+                    print(f"[MONGODB] Recording EMERGENCY CLOCK-OUT: {location_data.get('emergency_reason', 'No reason provided')}")
+                
+                print(f"[MONGODB] Recording {attendance_type.upper()} OUT with location: {location_data.get('location_name', 'Unknown')} - {location_data.get('address', '')}")
             
             result = self.attendance.insert_one(attendance_doc)
             
@@ -258,6 +266,53 @@ class MongoDBManager:
             print(f"[MONGODB ERROR] Failed to record attendance: {e}")
             return None
     
+    def record_attendance_bulk(self, nrics, method, status="out", attendance_type="check", timestamp=None, location_data=None):
+        """Record the same attendance event for several employees in one insert_many.
+        
+        Location fields are written with the records instead of a follow-up update.
+        Returns a list of record ids aligned with nrics (None where the insert failed).
+        """
+        try:
+            # Ensure connection is alive
+            if not self.ensure_connection():
+                return [None] * len(nrics)
+            
+            if not nrics:
+                return []
+            
+            if timestamp is None:
+                timestamp = datetime.now()
+            
+            base_doc = {
+                "timestamp": timestamp,
+                "method": method,
+                "status": status,
+                "attendance_type": attendance_type,
+                "late": False,
+                "overtime_hours": 0
+            }
+            if location_data:
+                base_doc["location_name"] = location_data.get("location_name", "")
+                base_doc["address"] = location_data.get("address", "")
+                if location_data.get("type"):
+                    base_doc["type"] = location_data.get("type")
+            
+            docs = [dict(base_doc, nric=nric) for nric in nrics]
+            failed = set()
+            try:
+                self.attendance.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                failed = {err['index'] for err in e.details.get('writeErrors', [])}
+                print(f"[MONGODB ERROR] {len(failed)} of {len(docs)} attendance inserts failed")
+            
+            record_ids = [None if i in failed else str(doc['_id']) for i, doc in enumerate(docs)]
+            print(f"[MONGODB] Recorded {attendance_type} {status} for {len(docs) - len(failed)} employees")
+            return record_ids
+            
+        except Exception as e:
+            print(f"[MONGODB ERROR] Failed to record bulk attendance: {e}")
+            return [None] * len(nrics)
+    
     def update_attendance_location(self, record_id, location_data):
         """Update an existing attendance record with location information"""
         try:
@@ -342,6 +397,7 @@ class MongoDBManager:
                         "status": 1,
                         "attendance_type": 1,
                         "late": {"$ifNull": ["$late", False]},
+                        "overtime_hours": {"$ifNull": ["$overtime_hours", 0]},
                         "location_name": {"$ifNull": ["$location_name", ""]},
                         "address": {"$ifNull": ["$address", ""]}
                     }
@@ -5,6 +5,8 @@ from tkinter import messagebox
 import cv2
 from PIL import Image, ImageTk
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import time
 import csv
 import os
@@ -12,6 +14,15 @@ import ctypes
 import re
 import numpy as np
 import traceback
+import sys
+import atexit
+import logging
+import logging.handlers
+import bisect
+import math
+import heapq
+from collections import defaultdict
+from functools import lru_cache, partial
 import pygame
 import time
 from datetime import datetime, timedelta, time as dt_time
@@ -38,13 +49,57 @@ except ImportError:
 AUDIO_AVAILABLE = PYGAME_AVAILABLE or WINSOUND_AVAILABLE
 print(f"[AUDIO] Audio system status - Pygame: {PYGAME_AVAILABLE}, Winsound: {WINSOUND_AVAILABLE}, Overall: {AUDIO_AVAILABLE}")
 
+# Face warm-up stability statistics over the recent samples of one face:
+# (largest distance from the oldest center, mean confidence, min confidence).
+# Compiled with Numba when it is installed, plain NumPy otherwise. The signature makes Numba
+# compile (or load from its cache) at import, not on the first face that finishes warm-up;
+# the tracker's ring buffers are float32, so their fancy-indexed slices are contiguous float32
+try:
+    import numba
+    
+    @numba.njit((numba.float32[:, ::1], numba.float32[::1]), cache=True, fastmath=True)
+    def _stability_stats(centers, confidences):
+        max_distance_sq = 0.0
+        for i in range(1, centers.shape[0]):
+            dx = centers[i, 0] - centers[0, 0]
+            dy = centers[i, 1] - centers[0, 1]
+            max_distance_sq = max(max_distance_sq, dx * dx + dy * dy)
+        total = 0.0
+        lowest = confidences[0]
+        for confidence in confidences:
+            total += confidence
+            lowest = min(lowest, confidence)
+        return np.sqrt(max_distance_sq), total / confidences.shape[0], lowest
+    
+    NUMBA_AVAILABLE = True
+except ImportError:
+    def _stability_stats(centers, confidences):
+        diffs = centers - centers[0]
+        return np.sqrt((diffs * diffs).sum(axis=1)).max(), confidences.mean(), confidences.min()
+    
+    NUMBA_AVAILABLE = False
+
 from core.mongodb_manager import MongoDBManager
 from core.deepface_recognition import DeepFaceRecognitionSystem, CameraManager
 from core.barcode_scanner import BarcodeScanner
 from core.attendance import AttendanceManager
 from core.mongo_location_manager import MongoLocationManager
+from core.location_selector import LocationSelector
 from core.attendance_ultra_light import AttendanceUltraLightDetector
 
+# Kiosk logging: records are queued on the calling thread and written to stdout by a
+# listener thread, so the Tk main loop never blocks on console I/O. Per-frame debug output
+# is only emitted with KIOSK_DEBUG=1; raise the level to WARNING for production builds.
+_DEBUG = os.environ.get("KIOSK_DEBUG") == "1"
+logger = logging.getLogger("kiosk")
+logger.setLevel(logging.DEBUG if _DEBUG else logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Set appearance mode and color theme2
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -52,7 +107,163 @@ ctk.set_default_color_theme("blue")
 # Configuration constants
 CONFIDENCE_THRESHOLD = 0.6  # Minimum confidence required for face recognition
 
+
+@lru_cache(maxsize=4096)
+def _parse_ts(timestamp):
+    """Parse an attendance record timestamp (cached, since the same rows are redrawn on every refresh)"""
+    return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+
+# Face distance feedback: face area / frame area thresholds and the result for each band
+# (< 3% too far, 3-8% acceptable, 8-25% optimal, 25-40% acceptable, > 40% too near).
+# Looked up with bisect_right, so a ratio equal to a threshold falls in the band above it;
+# 25% and 40% themselves belong to the band below, hence the next float up
+_DIST_THRESH = [0.03, 0.08, math.nextafter(0.25, math.inf), math.nextafter(0.40, math.inf)]
+_DIST_RESULT = [
+    (False, "Please move CLOSER to the camera", 'bad'),
+    (True, "Move a bit closer for optimal recognition", 'ok'),
+    (True, "Perfect distance - ready for recognition", 'perfect'),
+    (True, "Move a bit further for optimal recognition", 'ok'),
+    (False, "Please move FURTHER from the camera", 'bad'),
+]
+# Overlay colour (BGR) for each distance quality
+_DIST_COLORS = {
+    'perfect': (0, 255, 0),  # Green for perfect
+    'ok': (0, 255, 255),  # Yellow for acceptable
+    'bad': (0, 0, 255),  # Red for bad distance
+}
+
+@lru_cache(maxsize=32)
+def _feedback_banner(message, color):
+    """Render a distance feedback banner (text on a black box) once; it is pasted onto frames after that"""
+    text_size = cv2.getTextSize(message, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+    # +1: the filled rectangle this replaces included both corner points
+    banner = np.zeros((text_size[1] + 21, text_size[0] + 21, 3), dtype=np.uint8)
+    cv2.putText(banner, message, (10, text_size[1] + 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+    banner.flags.writeable = False  # Shared by every frame
+    return banner
+
+@lru_cache(maxsize=64)
+def _text_sprite(text, scale, color, thickness):
+    """Render overlay text once into (sprite, mask, ascent); drawn pixels are copied onto frames after that"""
+    (text_w, text_h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    pad = thickness  # Thick strokes spill a little past the measured box
+    sprite = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad, 3), dtype=np.uint8)
+    cv2.putText(sprite, text, (pad, text_h + pad), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    mask = sprite.any(axis=2)[..., None]
+    sprite.flags.writeable = False  # Shared by every frame
+    mask.flags.writeable = False
+    return sprite, mask, text_h + pad
+
+def _blit_text(frame, text, org, scale, color, thickness):
+    """Equivalent of cv2.putText using a cached sprite, clipped to the frame"""
+    sprite, mask, ascent = _text_sprite(text, scale, color, thickness)
+    sprite_h, sprite_w = sprite.shape[:2]
+    left, top = org[0] - thickness, org[1] - ascent
+    frame_h, frame_w = frame.shape[:2]
+    x0, y0 = max(left, 0), max(top, 0)
+    x1, y1 = min(left + sprite_w, frame_w), min(top + sprite_h, frame_h)
+    if x1 > x0 and y1 > y0:
+        np.copyto(frame[y0:y1, x0:x1], sprite[y0 - top:y1 - top, x0 - left:x1 - left],
+                  where=mask[y0 - top:y1 - top, x0 - left:x1 - left])
+
+# Early clock-out rejection message from AttendanceManager, e.g. "Cannot clock out before 5:00 PM (Early Shift)"
+_EARLY_CLOCKOUT_PREFIX = "Cannot clock out before"
+_EARLY_CLOCKOUT_RE = re.compile(r'Cannot clock out before (\d{1,2}:\d{2} [AP]M) \(([^)]+)\)')
+
+# Attendance history section colors (light, dark)
+_HIST_BORDER_COLOR = ("#8A2BE2", "#DDA0DD")  # BlueViolet and Plum
+_HIST_HEADER_COLOR = ("#8A2BE2", "#663399")  # BlueViolet and RebeccaPurple
+_HIST_FG_COLOR = ("gray95", "gray15")
+_HIST_ROW_COLORS = (("gray90", "gray20"), ("white", "gray25"))  # Alternating record row backgrounds
+
+# Group mode error notification text and colors, keyed by error type
+_GROUP_ERROR_CONFIGS = {
+    'not_clocked_in': {
+        'title': 'Cannot Add to Group',
+        'header': 'NOT CLOCKED IN',
+        'icon': '❌',
+        'bg_color': '#ff4444',
+        'description': 'Employee has not clocked in today'
+    },
+    'already_checked_out': {
+        'title': 'Cannot Add to Group', 
+        'header': 'ALREADY CHECKED OUT',
+        'icon': '⚠️',
+        'bg_color': '#ff8800',
+        'description': 'Employee is already in checked out status'
+    },
+    'not_in_check_window': {
+        'title': 'Cannot Add to Group',
+        'header': 'OUTSIDE CHECK WINDOW',
+        'icon': '🕐',
+        'bg_color': '#ff6600',
+        'description': 'Current time is outside the allowed check window'
+    },
+    'already_in_group': {
+        'title': 'Cannot Add to Group',
+        'header': 'ALREADY IN GROUP',
+        'icon': '✅',
+        'bg_color': '#3399ff',
+        'description': 'Employee is already added to the group list'
+    },
+    'final_clock_out': {
+        'title': 'Cannot Add to Group',
+        'header': 'ALREADY CLOCKED OUT',
+        'icon': '🔒',
+        'bg_color': '#666666',
+        'description': 'Employee has completed final clock out for today'
+    }
+}
+
 class SimpleKioskApp:
+    # Fixed shift boundaries used by the attendance decision logic
+    _T_1AM = dt_time(1, 0)
+    _T_6AM = dt_time(6, 0)
+    _T_MORNING_END = dt_time(7, 0)    # Night shift ends / Security day shift starts
+    _T_8AM = dt_time(8, 0)            # Early vs regular shift cut-off for Staff
+    _T_NOON = dt_time(12, 0)
+    _T_NIGHT_START = dt_time(18, 0)   # Security night shift starts
+    _T_DAY_END = dt_time(19, 0)       # Security day shift ends
+    _T_2359 = dt_time(23, 59)
+    
+    # (role, shift) -> (minimum clock-out time, shift label, clock-out display text)
+    # Staff entries depend on admin settings and are filled in by _reload_shift_config
+    _SECURITY_SHIFT_TABLE = {
+        ('Security', 'night'): (_T_MORNING_END, "Night Shift", "7:00 AM"),
+        ('Security', 'day'): (_T_DAY_END, "Day Shift", "7:00 PM"),
+    }
+    
+    # Group mode eligibility checks, evaluated in order against (last clock record, last check record)
+    _GROUP_GUARDS = (
+        (lambda clock, check: not clock, 'not_clocked_in', "{name} has not clocked in yet today"),
+        (lambda clock, check: clock['status'] == 'out', 'final_clock_out', "{name} has already clocked out for the day"),
+        (lambda clock, check: check is not None and check['status'] == 'out', 'already_checked_out', "{name} is already checked out"),
+    )
+    
+    # History row lookup tables: method labels, and status -> (text, color, icon)
+    _METHOD_ICONS_SHORT = {
+        'face_recognition': '👤 Face',
+        'qr_code': '🔍 QR',
+        'manual': '⌨️ Manual'
+    }
+    _STATUS_DISPLAY_UNIFIED = {'in': ("IN", "lightgreen", "⚫"), 'out': ("OUT", "red", "⚫")}
+    # Record attendance type -> (row text, color, icon)
+    _TYPE_DISPLAY = {'clock': ("CLOCK", "green", "🕐"), 'check': ("CHECK", "blue", "✅")}
+    # (is clock record, is in) -> history header status text
+    _STATUS_LABEL = {
+        (True, True): "Clock In",
+        (True, False): "Clock Out",
+        (False, True): "Check In",
+        (False, False): "Check Out",
+    }
+    
+    @classmethod
+    def _classify_shift(cls, role, clock_in_time):
+        """Map a role and clock-in time to its shift table key"""
+        if role == 'Security':
+            return ('Security', 'night' if clock_in_time >= cls._T_NIGHT_START else 'day')
+        return ('Staff', 'early' if clock_in_time < cls._T_8AM else 'regular')
+    
     def __init__(self):
         # Make application DPI-aware (must be done before creating tkinter window)
         try:
@@ -65,9 +276,18 @@ class SimpleKioskApp:
         self.root = ctk.CTk()
         self.root.title("Attendance Kiosk")
         
+        # Screen size is fixed for the kiosk, cache it for centering dialogs
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        
         # Kiosk mode settings
         self.setup_kiosk_mode()
         
+        # Set below when ultra light detection is enabled
+        self.ultra_light_detector = None
+        self._last_fps_draw_t = 0.0  # FPS overlay text is refreshed at ~2 Hz
+        self._fps_overlay_text = ""
+        
         # Initialize core components
         try:
             self.db = MongoDBManager()
@@ -100,8 +320,6 @@ class SimpleKioskApp:
             # Start background face processing
             self.face_recognition.start_background_processing()
             print("[INIT DEBUG] Background face processing started")
-            
-            self.ultra_light_detector = None
         
         self.camera_manager = CameraManager()
         print("[INIT DEBUG] Camera manager initialized")
@@ -116,6 +334,48 @@ class SimpleKioskApp:
         self.attendance_mode = "UNIFIED"  # Unified attendance system
         self.auto_timeout = 3  # seconds to show result
         self.last_history_update = 0  # for periodic updates
+        self._last_time_str = None  # Clock label text last shown
+        self._display_src_shape = None  # Camera frame shape the display size below was computed for
+        self._display_wh = None
+        
+        # Display frames are converted to RGB/PIL on a worker thread; the queue only ever holds
+        # the newest frame and the Tk thread picks up the finished image on its next camera tick
+        self._display_q = queue.Queue(maxsize=1)  # (camera session, display buffer)
+        self._display_ready = None  # (camera session, PIL image, the display buffer it wraps)
+        self._display_session = 0  # Bumped by stop_camera so frames converted for an old session are dropped
+        self._display_pool = []  # Display buffers free for reuse (only touched on the Tk thread)
+        self._camera_photo = None  # Persistent Tk image of the camera feed
+        self._last_frame_sig = None  # Signature of the last queued frame; unchanged frames are not re-sent
+        threading.Thread(target=self._display_worker, daemon=True).start()
+        
+        # Detection throttling: faces are detected every _detect_every_n frames and QR codes
+        # every _qr_every_n frames; the results in between come from the last detection frame
+        self._detect_every_n = 3
+        self._qr_every_n = 5
+        self._frame_idx = 0
+        self._last_recognized_faces = []
+        self._last_distance_feedback = None
+        
+        # QR scans are skipped while the scene is static: a 32x32 grayscale fingerprint of the
+        # last scanned frame is compared with the current one and the last result reused
+        self._static_frame_threshold = 2 * 32 * 32  # Sum of absolute differences (~2 levels per pixel)
+        self._last_frame_fp = None
+        self._last_scan_result = None
+        
+        # Scan lookups run on a single worker so DB latency never stalls the camera loop
+        self._attendance_executor = ThreadPoolExecutor(max_workers=1)
+        self._attendance_pending = False
+        
+        # Ultra-light face recognition runs on its own worker; the camera loop keeps running and
+        # picks up the result on the next detection frame. Holds (future, {face index: center},
+        # submit time); a result not picked up within about one detection interval of finishing
+        # is dropped, since the faces it was matched to may have changed
+        self._recognition_executor = ThreadPoolExecutor(max_workers=1)
+        self._recognition_future = None
+        self._recognition_max_age = 0.25  # Seconds
+        
+        # Known face (re)loads run on their own worker; the Tk thread polls the result
+        self._face_load_executor = ThreadPoolExecutor(max_workers=1)
         
         # Camera management for registration
         self.main_camera_paused = False  # Flag to pause main camera during registration
@@ -127,10 +387,59 @@ class SimpleKioskApp:
         self.face_warmup_frames = 15  # Number of consecutive frames required before recognition (increased from 3)
         self.face_warmup_stability_threshold = 0.08  # Maximum allowed face movement (reduced from 0.1 for more stability)
         self.face_detection_history = {}  # Track detected faces across frames
+        self._face_last_seen_heap = []  # (last_seen frame, face_id) min-heap for expiring history
         self.frame_counter = 0  # Frame counter for tracking
         self.last_recognition_time = 0  # Prevent too frequent recognitions
         self.recognition_cooldown = 3.0  # Seconds between recognitions for same face (increased from 2.0)
         
+        # Camera loop state (initialized here so the per-frame code reads them directly)
+        self.last_focus_check = 0.0
+        self.camera_fail_count = 0
+        self._pause_debug_shown = False
+        self.camera_start_time = 0.0
+        self.debug_counter = 0
+        
+        # Personal/group scanning hand-off (ID entry widgets are set while a scan dialog is open)
+        self.personal_scanning_active = False
+        self.group_scanning_active = False
+        self.personal_id_entry = None
+        self.group_current_id = None
+        
+        # Reusable dialogs (built on first use, then hidden and re-shown)
+        self._manual_entry_dialog = None
+        self._notification_dialogs = {}  # Notification popups keyed by (width, height)
+        self._error_popup = None  # Borderless auto-dismiss error popup
+        self._fc_dialog = None
+        self._fc_on_result = None  # Continuation for the face confirmation dialog's answer
+        self._dialog_after_ids = {}  # Pending auto-close timer per pooled dialog
+        self._message_after_id = None  # Pending status message auto-hide
+        self._quit_after_id = None  # Pending quit confirmation auto-cancel
+        self.quit_overlay = None  # Quit confirmation overlay, built on first use and then reused
+        
+        # Employee role per NRIC for the history display and employee record per recognized
+        # NRIC for the camera loop (both cleared when employee data is reloaded)
+        self._role_cache = {}
+        self._employee_cache = {}
+        
+        # Signature of the records last rendered in the history panel, and the rendered
+        # section per NRIC (frame, status label and record rows) so refreshes only touch changes
+        self._last_history_hash = None
+        self._history_sections = {}
+        self._section_pool = []  # Hidden sections released by earlier refreshes
+        self._history_empty_label = None
+        
+        # Fonts shared by every history section header and record row
+        self._hist_name_font = ctk.CTkFont(size=24, weight="bold")
+        self._hist_id_font = ctk.CTkFont(size=16, weight="bold")
+        self._hist_header_font = ctk.CTkFont(size=14, weight="bold")
+        self._hist_row_font = ctk.CTkFont(family="Consolas", size=16, weight="bold")  # Fixed width for aligned row columns
+        
+        # Record row fonts keyed by (weight, size), created once instead of per label
+        self._fonts = {
+            (weight, size): ctk.CTkFont(size=size, weight=weight)
+            for weight, size in (("bold", 16), ("bold", 18), ("normal", 12), ("normal", 14), ("normal", 20))
+        }
+        
         # Create GUI
         self.create_interface()
         
@@ -138,6 +447,18 @@ class SimpleKioskApp:
         self.audio_enabled = True  # Can be toggled via settings if needed
         print(f"[AUDIO] Audio feedback initialized: {AUDIO_AVAILABLE}")
         
+        # Decode the detection sound once instead of on every beep
+        self._scan_sound = None
+        if PYGAME_AVAILABLE and os.path.exists("scan.mp3"):
+            try:
+                self._scan_sound = pygame.mixer.Sound("scan.mp3")
+            except Exception as e:
+                print(f"[AUDIO] Error loading scan.mp3: {e}")
+        
+        # One background worker plays queued sounds instead of a new thread per beep
+        self._audio_q = queue.Queue()
+        threading.Thread(target=self._audio_worker, daemon=True).start()
+        
         # Load shift settings from database (managed via web admin)
         self.load_shift_settings_from_db()
         
@@ -173,6 +494,10 @@ class SimpleKioskApp:
             print("[CAMERA DEBUG] Resuming camera after popup closed")
             self.main_camera_paused = False
     
+    def _center_dialog(self, dialog, w, h):
+        """Size a dialog and center it on screen in a single geometry call"""
+        dialog.geometry(f"{w}x{h}+{(self._screen_w - w) // 2}+{(self._screen_h - h) // 2}")
+    
     def setup_kiosk_mode(self):
         """Configure for kiosk operation"""
         # Get actual screen size (handling DPI scaling)
@@ -185,13 +510,13 @@ class SimpleKioskApp:
             print(f"[KIOSK DEBUG] True screen dimensions (via Windows API): {screen_width}x{screen_height}")
         except:
             # Fallback to tkinter method
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
+            screen_width = self._screen_w
+            screen_height = self._screen_h
             print(f"[KIOSK DEBUG] Fallback screen dimensions (via tkinter): {screen_width}x{screen_height}")
         
         # Also show what tkinter thinks the screen size is
-        tk_width = self.root.winfo_screenwidth()
-        tk_height = self.root.winfo_screenheight()
+        tk_width = self._screen_w
+        tk_height = self._screen_h
         print(f"[KIOSK DEBUG] Tkinter detected dimensions: {tk_width}x{tk_height}")
         
         try:
@@ -405,6 +730,7 @@ class SimpleKioskApp:
             font=ctk.CTkFont(size=20)
         )
         self.camera_label.pack(expand=True, padx=15, pady=15)
+        self.camera_label.image = None  # Tk image currently shown (kept referenced here)
         
         # Group Check Toggle
         self.group_toggle_frame = ctk.CTkFrame(self.camera_frame)
@@ -472,6 +798,13 @@ class SimpleKioskApp:
         
         # Initialize group data
         self.group_employees = []
+        self._group_nrics = set()  # Membership index for group_employees
+        self._group_row_widgets = []  # (frame, label, button) per displayed row, reused by index
+        self._group_btn_state = None
+        # NRICs submitted by a group checkout whose insert is still running; they stay in the
+        # list (and can't be removed) until it finishes, employees added meanwhile are kept
+        self._group_checkout_pending = False
+        self._group_checkout_nrics = frozenset()
         
         # Right side - Attendance history (larger, expandable)
         self.control_frame = ctk.CTkFrame(self.content_frame)
@@ -624,7 +957,8 @@ class SimpleKioskApp:
                 
                 print(f"[SETTINGS] Using default shift settings - Early: {self.early_shift_min_clockout}, Regular: {self.regular_shift_min_clockout}")
             
-            # Update attendance manager with loaded settings
+            # Pre-parse shift times and update attendance manager with loaded settings
+            self._reload_shift_config()
             self.update_attendance_manager_settings()
             
         except Exception as e:
@@ -640,8 +974,36 @@ class SimpleKioskApp:
             self.recognition_cooldown = 3.0
             
             # Still try to update attendance manager
+            self._reload_shift_config()
             self.update_attendance_manager_settings()
     
+    def _reload_shift_config(self):
+        """Parse the HH:MM minimum clock-out settings once so the attendance path can compare times directly"""
+        try:
+            self._early_min_clockout_t = dt_time(*map(int, self.early_shift_min_clockout.split(':')))
+            self._regular_min_clockout_t = dt_time(*map(int, self.regular_shift_min_clockout.split(':')))
+        except Exception as e:
+            print(f"[SETTINGS] Error parsing shift times, using defaults: {e}")
+            self.early_shift_min_clockout = '17:00'
+            self.regular_shift_min_clockout = '17:15'
+            self._early_min_clockout_t = dt_time(17, 0)
+            self._regular_min_clockout_t = dt_time(17, 15)
+        
+        self._shift_table = dict(self._SECURITY_SHIFT_TABLE)
+        self._shift_table[('Staff', 'early')] = (self._early_min_clockout_t, "Early", self.early_shift_min_clockout)
+        self._shift_table[('Staff', 'regular')] = (self._regular_min_clockout_t, "Regular", self.regular_shift_min_clockout)
+    
+    def _shift_status(self, role, clock_in_time, current_time_only):
+        """Look up the employee's shift and whether the final clock-out time has been reached"""
+        shift_key = self._classify_shift(role, clock_in_time)
+        min_clockout_t, shift_name, min_clockout = self._shift_table[shift_key]
+        if shift_key == ('Security', 'night'):
+            # Overnight shift: still on duty only from shift start until midnight
+            is_clock_out_time = current_time_only < self._T_NIGHT_START
+        else:
+            is_clock_out_time = current_time_only >= min_clockout_t
+        return shift_name, min_clockout, is_clock_out_time
+    
     def update_attendance_manager_settings(self):
         """Update the attendance manager with shift settings from database"""
         try:
@@ -667,6 +1029,9 @@ class SimpleKioskApp:
             try:
                 print(f"[AUTO-REFRESH] Reloading shift settings from database...")
                 self.load_shift_settings_from_db()
+                # Employees are edited via the web admin, pick up role changes too
+                self._role_cache.clear()
+                self._employee_cache.clear()
             except Exception as e:
                 print(f"[AUTO-REFRESH] Error refreshing settings: {e}")
             finally:
@@ -679,74 +1044,41 @@ class SimpleKioskApp:
     
     def _check_face_distance_and_provide_feedback(self, frame, face_coords):
         if face_coords is None:
-            return False, "Please position your face in the camera view"
+            return False, "Please position your face in the camera view", 'bad'
         
-        try:
-            x, y, w, h = face_coords
-            
-            # Calculate face size relative to frame
-            frame_area = frame.shape[0] * frame.shape[1]
-            face_area = w * h
-            face_ratio = face_area / frame_area
-            
-            # Define distance thresholds
-            TOO_FAR_THRESHOLD = 0.03    # Less than 3% of frame
-            TOO_NEAR_THRESHOLD = 0.4    # More than 40% of frame
-            OPTIMAL_MIN = 0.08          # 8% for optimal range
-            OPTIMAL_MAX = 0.25          # 25% for optimal range
-            
-            # Check distance and provide specific feedback
-            if face_ratio < TOO_FAR_THRESHOLD:
-                return False, "Please move CLOSER to the camera"
-            elif face_ratio > TOO_NEAR_THRESHOLD:
-                return False, "Please move FURTHER from the camera"
-            elif face_ratio < OPTIMAL_MIN:
-                return True, "Move a bit closer for optimal recognition"
-            elif face_ratio > OPTIMAL_MAX:
-                return True, "Move a bit further for optimal recognition"
-            else:
-                return True, "Perfect distance - ready for recognition"
-                
-        except Exception as e:
-            print(f"[DISTANCE CHECK] Error checking distance: {e}")
-            return False, "Error checking face distance"
+        x, y, w, h = face_coords
+        
+        # Calculate face size relative to frame
+        frame_area = frame.shape[0] * frame.shape[1]
+        if frame_area == 0:
+            return False, "Please position your face in the camera view", 'bad'
+        face_ratio = (w * h) / frame_area
+        
+        # Look up the distance band and its feedback
+        return _DIST_RESULT[bisect.bisect_right(_DIST_THRESH, face_ratio)]
 
-    def _display_distance_feedback(self, display_frame, feedback_message, is_good_distance):
-        try:
-            # Choose color based on distance quality
-            if is_good_distance:
-                if "Perfect distance" in feedback_message:
-                    color = (0, 255, 0)  # Green for perfect
-                else:
-                    color = (0, 255, 255)  # Yellow for acceptable
-            else:
-                color = (0, 0, 255)  # Red for bad distance
-            
-            # Display feedback at top of frame
-            frame_height, frame_width = display_frame.shape[:2]
-            
-            # Background rectangle for better text visibility
-            text_size = cv2.getTextSize(feedback_message, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-            rect_width = text_size[0] + 20
-            rect_height = text_size[1] + 20
-            rect_x = (frame_width - rect_width) // 2
-            rect_y = 20
-            
-            # Draw background rectangle
-            cv2.rectangle(display_frame, 
-                         (rect_x, rect_y), 
-                         (rect_x + rect_width, rect_y + rect_height), 
-                         (0, 0, 0), -1)
-            
-            # Draw text
-            text_x = rect_x + 10
-            text_y = rect_y + text_size[1] + 10
-            cv2.putText(display_frame, feedback_message, 
-                       (text_x, text_y), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-            
-        except Exception as e:
-            print(f"[DISPLAY FEEDBACK] Error displaying feedback: {e}")
+    def _display_distance_feedback(self, display_frame, feedback_message, quality):
+        if display_frame is None or display_frame.size == 0:
+            return
+        
+        # Remembered so frames that skip detection can repeat the same banner
+        self._last_distance_feedback = (feedback_message, quality)
+        
+        # Choose color based on distance quality
+        color = _DIST_COLORS[quality]
+        
+        # Display feedback at top of frame: the pre-rendered banner (black background for better
+        # text visibility) is copied in, clipped to the frame
+        frame_height, frame_width = display_frame.shape[:2]
+        banner = _feedback_banner(feedback_message, color)
+        banner_height, banner_width = banner.shape[:2]
+        rect_x = (frame_width - (banner_width - 1)) // 2
+        rect_y = 20
+        
+        x0, y0 = max(rect_x, 0), rect_y
+        x1, y1 = min(rect_x + banner_width, frame_width), min(rect_y + banner_height, frame_height)
+        if x1 > x0 and y1 > y0:
+            display_frame[y0:y1, x0:x1] = banner[y0 - rect_y:y1 - rect_y, x0 - rect_x:x1 - rect_x]
     
     def update_unified_attendance_display(self):
         """Update the unified attendance display with all records"""
@@ -762,47 +1094,60 @@ class SimpleKioskApp:
         # Pause camera when popup appears
         self.pause_camera_for_popup()
         
+        # Build the dialog once and reuse it on later opens
+        if self._manual_entry_dialog is None or not self._manual_entry_dialog.winfo_exists():
+            self._build_manual_entry_dialog()
+        
+        dialog = self._manual_entry_dialog
+        self._manual_entry_var.set('')
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        self._manual_entry.focus_set()
+    
+    def _build_manual_entry_dialog(self):
+        """Create the hidden manual entry dialog used by show_simple_manual_entry"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Manual Entry")
-        dialog.geometry("400x250")
         dialog.transient(self.root)
-        dialog.grab_set()
         
         # Center dialog on screen
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (400 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (250 // 2)
-        dialog.geometry(f"400x250+{x}+{y}")
+        self._center_dialog(dialog, 400, 250)
         
         # Entry widgets
         tk.Label(dialog, text="Enter Employee ID:", font=("Arial", 16)).pack(pady=20)
         
-        def validate_input(char, current_text):
-            return char.isdigit() and len(current_text) <= 12
+        # Keep the entry to at most 12 digits (runs once per change, not per key validation)
+        entry_var = tk.StringVar()
+        
+        def on_change(*_):
+            value = entry_var.get()
+            if not value.isdigit() and value != '':
+                entry_var.set(''.join(c for c in value if c.isdigit())[:12])
+            elif len(value) > 12:
+                entry_var.set(value[:12])
         
-        vcmd = (dialog.register(validate_input), '%S', '%P')
+        entry_var.trace_add('write', on_change)
         
         entry = tk.Entry(dialog, font=("Arial", 14), width=20, justify="center",
-                        validate='key', validatecommand=vcmd)
+                        textvariable=entry_var)
         entry.pack(pady=10)
-        entry.focus_set()
         
-        def submit():
-            nric = entry.get().strip()
-            dialog.destroy()
+        def hide():
+            dialog.grab_release()
+            dialog.withdraw()
             # Resume camera after popup closes
             self.resume_camera_after_popup()
+        
+        def submit():
+            nric = entry.get().strip()
+            hide()
             if nric and nric.isdigit():
                 self.process_manual_entry(nric)
             elif nric:
                 self.show_error_message("✗ NRIC must contain only numbers")
             else:
                 self.show_error_message("✗ Please enter an NRIC")
-
-        def cancel():
-            dialog.destroy()
-            # Resume camera after popup closes
-            self.resume_camera_after_popup()
         
         # Buttons
         button_frame = tk.Frame(dialog)
@@ -811,16 +1156,22 @@ class SimpleKioskApp:
         tk.Button(button_frame, text="Submit", font=("Arial", 12), 
                  command=submit, width=10).pack(side="left", padx=10)
         tk.Button(button_frame, text="Cancel", font=("Arial", 12), 
-                 command=cancel, width=10).pack(side="left", padx=10)
+                 command=hide, width=10).pack(side="left", padx=10)
         
         # Bind Enter key
         entry.bind('<Return>', lambda e: submit())
-        dialog.bind('<Escape>', lambda e: cancel())
+        dialog.bind('<Escape>', lambda e: hide())
+        dialog.protocol("WM_DELETE_WINDOW", hide)
+        
+        dialog.withdraw()
+        self._manual_entry_dialog = dialog
+        self._manual_entry = entry
+        self._manual_entry_var = entry_var
 
     def process_manual_entry(self, nric):
         employee = self.db.get_employee(nric)
         if employee:
-            success, message = self.process_attendance_with_location_check(nric, "manual")
+            success, message = self.process_attendance_with_location_check(nric, "manual", employee)
             if success and message != "Location selection initiated":
                 self.show_success_message(f"✓ {employee['name']} - {message}")
             elif not success:
@@ -833,41 +1184,42 @@ class SimpleKioskApp:
         else:
             self.show_employee_not_found_dialog(nric)
 
-    def process_attendance_with_location_check(self, nric, method):
+    def _latest_clock_and_check(self, today_records):
+        """Return the most recent clock and check records from today's records in a single pass"""
+        last_clock_record = last_check_record = None
+        for r in today_records:
+            t = r.get('attendance_type')
+            ts = r['timestamp']
+            if t == 'clock':
+                if last_clock_record is None or ts > last_clock_record['timestamp']:
+                    last_clock_record = r
+            elif t == 'check':
+                if last_check_record is None or ts > last_check_record['timestamp']:
+                    last_check_record = r
+        return last_clock_record, last_check_record
+
+    def process_attendance_with_location_check(self, nric, method, employee=None, today_records=None):
         """Process unified attendance with smart logic for clock/check operations"""
-        employee = self.db.get_employee(nric)
+        # Callers that already looked up the employee (and today's records) pass them in
+        # to save DB round-trips
+        employee = employee or self.db.get_employee(nric)
         if not employee:
             return False, f"Employee {nric} not found"
+        if today_records is None:
+            today_records = self.attendance_manager.get_employee_attendance_today(nric)
 
         # Check if group mode is enabled
         if hasattr(self, 'group_check_var') and self.group_check_var.get():
             # Group mode is ON - add to group list instead of processing immediately
             employee_name = employee['name']
             
-            # Get today's attendance records
-            today_records = self.attendance_manager.get_employee_attendance_today(nric)
-            clock_records = [r for r in today_records if r.get('attendance_type') == 'clock']
-            clock_records.sort(key=lambda x: x['timestamp'], reverse=True)
-            last_clock_record = clock_records[0] if clock_records else None
-            
-            # Check if employee has clocked in today
-            if not last_clock_record:
-                self.show_group_error_notification(employee_name, nric, 'not_clocked_in')
-                return False, f"{employee_name} has not clocked in yet today"
-            
-            # Check if employee has already clocked out (final clock out)
-            if last_clock_record['status'] == 'out':
-                self.show_group_error_notification(employee_name, nric, 'final_clock_out')
-                return False, f"{employee_name} has already clocked out for the day"
+            last_clock_record, last_check_record = self._latest_clock_and_check(today_records)
             
-            # Check if employee is already checked out (can't add to group if already checked out)
-            check_records = [r for r in today_records if r.get('attendance_type') == 'check']
-            check_records.sort(key=lambda x: x['timestamp'], reverse=True)
-            last_check_record = check_records[0] if check_records else None
-            
-            if last_check_record and last_check_record['status'] == 'out':
-                self.show_group_error_notification(employee_name, nric, 'already_checked_out')
-                return False, f"{employee_name} is already checked out"
+            # Employee must be clocked in and not already checked out to join the group
+            for predicate, error_type, message in self._GROUP_GUARDS:
+                if predicate(last_clock_record, last_check_record):
+                    self.show_group_error_notification(employee_name, nric, error_type)
+                    return False, message.format(name=employee_name)
             
             # Validate that employee is within the allowed time window for check operations
             current_time = self.attendance_manager.get_current_time()
@@ -875,46 +1227,12 @@ class SimpleKioskApp:
             
             # Get employee role and clock-in time to determine shift
             employee_role = employee.get('role', 'Staff')
-            clock_in_time = datetime.fromisoformat(last_clock_record['timestamp']).time()
-            
-            # Determine if current time is within check operation window
-            is_within_check_window = False
-            
-            if employee_role == 'Security':
-                # Security: Same logic as clock-out time determination
-                if clock_in_time >= dt_time(18, 0):  # Night shift
-                    if current_time_only < dt_time(7, 0):  # Next day morning
-                        is_within_check_window = False  # Can clock out now
-                    elif current_time_only >= dt_time(18, 0):  # Same day, still in night shift
-                        is_within_check_window = True  # Can check in/out
-                    else:  # Same day, after 7 AM but before 6 PM
-                        is_within_check_window = False  # Should have clocked out
-                else:  # Day shift
-                    is_within_check_window = current_time_only < dt_time(19, 0)  # Before 7:00 PM
-            else:
-                # Staff: Must be within the check window (after clock in, before minimum clock out time)
-                # Check window ends when they're allowed to do final clock out
-                if clock_in_time < dt_time(8, 0):  # Early shift
-                    early_hour, early_minute = map(int, self.early_shift_min_clockout.split(':'))
-                    final_clockout_time = dt_time(early_hour, early_minute)
-                    is_within_check_window = current_time_only < final_clockout_time
-                else:  # Regular shift
-                    regular_hour, regular_minute = map(int, self.regular_shift_min_clockout.split(':'))
-                    final_clockout_time = dt_time(regular_hour, regular_minute)
-                    is_within_check_window = current_time_only < final_clockout_time
-            
-            if not is_within_check_window:
-                if employee_role == 'Security':
-                    if clock_in_time >= dt_time(18, 0):  # Night shift
-                        min_clockout = "7:00 AM"
-                        shift_type = "Night Shift"
-                    else:  # Day shift
-                        min_clockout = "7:00 PM"
-                        shift_type = "Day Shift"
-                else:
-                    shift_type = "Early" if clock_in_time < dt_time(8, 0) else "Regular"
-                    min_clockout = self.early_shift_min_clockout if shift_type == "Early" else self.regular_shift_min_clockout
-                
+            clock_in_time = last_clock_record['_time_of_day']
+            
+            # Check operations are only allowed until the final clock-out time for the shift
+            shift_type, min_clockout, is_clock_out_time = self._shift_status(employee_role, clock_in_time, current_time_only)
+            
+            if is_clock_out_time:
                 additional_info = f"Current time: {current_time_only.strftime('%I:%M %p')}\nMinimum clock-out: {min_clockout}"
                 self.show_group_error_notification(employee_name, nric, 'not_in_check_window', additional_info)
                 return False, f"{employee_name} can only do final clock out now (after {min_clockout}), not check out"
@@ -928,14 +1246,8 @@ class SimpleKioskApp:
         
         # Normal mode - continue with regular processing
         
-        # Get today's attendance records to determine what action to take
-        today_records = self.attendance_manager.get_employee_attendance_today(nric)
-        clock_records = [r for r in today_records if r.get('attendance_type') == 'clock']
-        clock_records.sort(key=lambda x: x['timestamp'], reverse=True)
-        last_clock_record = clock_records[0] if clock_records else None
-        check_records = [r for r in today_records if r.get('attendance_type') == 'check']
-        check_records.sort(key=lambda x: x['timestamp'], reverse=True)
-        last_check_record = check_records[0] if check_records else None
+        # Today's attendance records determine what action to take
+        last_clock_record, last_check_record = self._latest_clock_and_check(today_records)
 
         attendance_type = None
         status = None
@@ -955,19 +1267,17 @@ class SimpleKioskApp:
             night_shift_in = None
             for r in prev_clock_ins:
                 t = datetime.fromisoformat(r['timestamp']).time()
-                if t >= dt_time(18, 0):  # Night shift clock-in (6:00 PM or later)
+                if t >= self._T_NIGHT_START:  # Night shift clock-in (6:00 PM or later)
                     night_shift_in = r
                     break
             
             # If there's an unfinished night shift from previous day, force clock-out
             if night_shift_in and not prev_clock_outs:
-                if current_time_only >= dt_time(7, 0):
+                if current_time_only >= self._T_MORNING_END:
                     # Force clock-out for previous night shift - handle directly
-                    employee = self.db.get_employee(nric)
                     current_time = self.attendance_manager.get_current_time()
                     
                     # Calculate overtime for night shift
-                    min_clock_out_time = dt_time(7, 0)
                     total_seconds = (current_time_only.hour * 3600 + current_time_only.minute * 60) - (7 * 3600)
                     if total_seconds > 0:
                         overtime_hours = max(0, int(total_seconds / 3600))
@@ -990,11 +1300,11 @@ class SimpleKioskApp:
             # No previous night shift to complete - proceed with normal logic
             if not last_clock_record:
                 # No clock record today - this is a new clock-in
-                if dt_time(6, 0) <= current_time_only < dt_time(12, 0):
-                    late = current_time_only > dt_time(7, 0)
+                if self._T_6AM <= current_time_only < self._T_NOON:
+                    late = current_time_only > self._T_MORNING_END
                     shift_name = "Day Shift"
-                elif dt_time(18, 0) <= current_time_only <= dt_time(23, 59) or dt_time(0, 0) <= current_time_only < dt_time(1, 0):
-                    late = current_time_only > dt_time(19, 0)
+                elif self._T_NIGHT_START <= current_time_only <= self._T_2359 or current_time_only < self._T_1AM:
+                    late = current_time_only > self._T_DAY_END
                     shift_name = "Night Shift"
                 else:
                     late = False
@@ -1013,33 +1323,8 @@ class SimpleKioskApp:
         elif last_clock_record['status'] == 'in':
             # Already clocked in - determine if this should be check in/out or final clock out
             # Check current time to see if it's appropriate for clock out
-            clock_in_time = datetime.fromisoformat(last_clock_record['timestamp']).time()
-            is_clock_out_time = False
-            
-            if employee_role == 'Security':
-                # Security: Check against expected shift end times
-                if clock_in_time >= dt_time(18, 0):  # Night shift (6:00 PM - 7:00 AM next day)
-                    # Night shift can clock out at 7:00 AM next day
-                    # If it's same day and before midnight, not time to clock out yet
-                    if current_time_only < dt_time(7, 0):  # Next day morning
-                        is_clock_out_time = True
-                    elif current_time_only >= dt_time(18, 0):  # Same day, still in night shift
-                        is_clock_out_time = False
-                    else:  # Same day, after 7 AM but before 6 PM - should have clocked out already
-                        is_clock_out_time = True
-                else:  # Day shift (6:00 AM - 7:00 PM same day)
-                    # Day shift can clock out at 7:00 PM
-                    is_clock_out_time = current_time_only >= dt_time(19, 0)  # 7:00 PM
-            else:
-                # Staff: Original logic
-                if clock_in_time < dt_time(8, 0):
-                    early_hour, early_minute = map(int, self.early_shift_min_clockout.split(':'))
-                    min_clock_out = dt_time(early_hour, early_minute)
-                    is_clock_out_time = current_time_only >= min_clock_out
-                else:
-                    regular_hour, regular_minute = map(int, self.regular_shift_min_clockout.split(':'))
-                    min_clock_out = dt_time(regular_hour, regular_minute)
-                    is_clock_out_time = current_time_only >= min_clock_out
+            clock_in_time = last_clock_record['_time_of_day']
+            _, _, is_clock_out_time = self._shift_status(employee_role, clock_in_time, current_time_only)
             if is_clock_out_time:
                 attendance_type = "clock"
                 status = "out"
@@ -1056,7 +1341,7 @@ class SimpleKioskApp:
 
         # Handle location selection for check out operations
         if attendance_type == "check" and status == "out":
-            self.handle_checkout_with_location_first_unified(nric, method)
+            self.handle_checkout_with_location_first_unified(nric, method, employee)
             return True, "Location selection initiated"
 
         # Process normal attendance (clock in/out, check in)
@@ -1065,8 +1350,9 @@ class SimpleKioskApp:
         )
         return success, message
     
-    def handle_checkout_with_location_first_unified(self, nric, method):
+    def handle_checkout_with_location_first_unified(self, nric, method, employee=None):
         """Handle checkout by showing location selection first, then recording attendance for unified system"""
+        employee = employee or self.db.get_employee(nric)
         
         # Pause camera to prevent continuous face recognition during location selection
         self.pause_camera_for_popup()
@@ -1085,39 +1371,24 @@ class SimpleKioskApp:
                     print(f"[EMERGENCY DEBUG] Processing emergency clock-out for {nric}")
                     print(f"[EMERGENCY DEBUG] Location: {location.get('name')}, Reason: {emergency_reason}")
                     
+                    # Emergency information is stored with the clock-out record in a single write
+                    location_data = {
+                        "location_name": location.get('name', ''),
+                        "address": location.get('address', ''),
+                        "emergency_clockout": True,
+                        "emergency_reason": emergency_reason
+                    }
+                    
                     # Process emergency clock-out with override flag
                     success, message = self.attendance_manager.process_attendance(
-                        nric, method, "clock", None, emergency_override=True
+                        nric, method, "clock", None, emergency_override=True, location_data=location_data
                     )
                     
                     if success:
-                        # Get the attendance record ID from the message or query latest record
-                        employee = self.db.get_employee(nric)
-                        today_records = self.attendance_manager.get_employee_attendance_today(nric)
-                        
-                        # Get the most recent clock record
-                        clock_records = [r for r in today_records if r.get('attendance_type') == 'clock']
-                        if clock_records:
-                            clock_records.sort(key=lambda x: x['timestamp'], reverse=True)
-                            latest_record = clock_records[0]
-                            record_id = latest_record.get('_id')
-                            
-                            # Update record with emergency information
-                            location_data = {
-                                "location_name": location.get('name', ''),
-                                "address": location.get('address', ''),
-                                "emergency_clockout": True,
-                                "emergency_reason": emergency_reason
-                            }
-                            
-                            self.db.update_attendance_location(record_id, location_data)
-                            
-                            location_name = location.get('name', 'Emergency location')
-                            self.show_success_message(
-                                f"🚨 {employee['name']} - EMERGENCY CLOCK-OUT\n📍 Going to: {location_name}\n⚠️ Reason: {emergency_reason[:50]}..."
-                            )
-                        else:
-                            self.show_success_message(f"🚨 {employee['name']} - EMERGENCY CLOCK-OUT\n{message}")
+                        location_name = location.get('name', 'Emergency location')
+                        self.show_success_message(
+                            f"🚨 {employee['name']} - EMERGENCY CLOCK-OUT\n📍 Going to: {location_name}\n⚠️ Reason: {emergency_reason[:50]}..."
+                        )
                     else:
                         self.show_error_message(f"✗ Emergency clock-out failed: {message}")
                     
@@ -1140,7 +1411,6 @@ class SimpleKioskApp:
                     success = self.db.update_attendance_location(record_id, location_data)
                     
                     if success:
-                        employee = self.db.get_employee(nric)
                         location_name = location.get('name', 'Selected location')
                         self.show_success_message(
                             f"✓ {employee['name']} checked out\n📍 Going to: {location_name}"
@@ -1157,7 +1427,6 @@ class SimpleKioskApp:
                 print("[LOCATION DEBUG] User cancelled location selection - checkout cancelled")
         
         # Open location selector dialog
-        from core.location_selector import LocationSelector
         LocationSelector(
             parent=self.root,
             nric=nric,
@@ -1202,7 +1471,6 @@ class SimpleKioskApp:
                 self.show_success_message(f"✓ {employee['name']} checked out")
         
         # Open location selector dialog
-        from core.location_selector import LocationSelector
         LocationSelector(
             parent=self.root,
             nric=nric,
@@ -1211,297 +1479,140 @@ class SimpleKioskApp:
     
     def show_employee_not_found_dialog(self, nric):
         """Show a dedicated error dialog for employee not found"""
-        # Pause camera when popup appears
-        self.pause_camera_for_popup()
-        
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Employee Not Found")
-        dialog.geometry("350x200")
-        dialog.transient(self.root)
+        self._show_notification(
+            "Employee Not Found", '#ff4444', "❌", "EMPLOYEE NOT FOUND",
+            f"Employee ID: {nric}\nPlease check the ID and try again", size=(350, 200)
+        )
+    
+    def _show_pooled_dialog(self, dialog, ok_button, auto_close_ms):
+        """Re-show a hidden pooled dialog and (re)start its auto-close timer"""
+        dialog.deiconify()
+        dialog.lift()
         dialog.grab_set()
-        dialog.resizable(False, False)
-        
-        # Center dialog on screen
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (350 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (200 // 2)
-        dialog.geometry(f"350x200+{x}+{y}")
-        
-        # Configure dialog background
-        dialog.configure(bg='#ff4444')
-        
-        # Error icon and message
-        main_frame = tk.Frame(dialog, bg='#ff4444')
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Error icon
-        tk.Label(main_frame, text="❌", font=("Arial", 32), 
-                bg='#ff4444', fg='white').pack(pady=10)
-        
-        # Error message
-        tk.Label(main_frame, text="EMPLOYEE NOT FOUND", 
-                font=("Arial", 14, "bold"), bg='#ff4444', fg='white').pack()
-        
-        tk.Label(main_frame, text=f"Employee ID: {nric}", 
-                font=("Arial", 12), bg='#ff4444', fg='white').pack(pady=5)
-        
-        tk.Label(main_frame, text="Please check the ID and try again", 
-                font=("Arial", 10), bg='#ff4444', fg='white').pack(pady=5)
-        
-        # Close function to resume camera
-        def close_dialog():
-            dialog.destroy()
-            self.resume_camera_after_popup()
-        
-        # OK button
-        ok_button = tk.Button(main_frame, text="OK", font=("Arial", 12, "bold"),
-                             command=close_dialog, width=10,
-                             bg='white', fg='#ff4444', relief='raised', bd=2)
-        ok_button.pack(pady=15)
         ok_button.focus_set()
         
-        # Bind Enter and Escape keys
-        dialog.bind('<Return>', lambda e: close_dialog())
-        dialog.bind('<Escape>', lambda e: close_dialog())
-        
-        # Auto-close after 5 seconds
-        dialog.after(5000, close_dialog)
-    
-    def show_already_checked_out_dialog(self, employee_name, nric):
-        """Show error dialog for employee already checked out"""
+        # Restart the timer if the dialog is already showing
+        after_id = self._dialog_after_ids.pop(dialog, None)
+        if after_id:
+            dialog.after_cancel(after_id)
+        self._dialog_after_ids[dialog] = dialog.after(auto_close_ms, lambda: self._hide_pooled_dialog(dialog))
+    
+    def _hide_pooled_dialog(self, dialog):
+        """Hide a pooled dialog for later reuse and resume the camera"""
+        after_id = self._dialog_after_ids.pop(dialog, None)
+        if after_id:
+            dialog.after_cancel(after_id)
+        dialog.grab_release()
+        dialog.withdraw()
+        self.resume_camera_after_popup()
+    
+    def _show_notification(self, title, bg_color, icon, header, details="", auto_close_ms=5000, size=(400, 250)):
+        """Show a colored notification popup (icon, header, optional details, OK button) that auto-closes"""
         # Pause camera when popup appears
         self.pause_camera_for_popup()
         
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Already Checked Out")
-        dialog.geometry("350x200")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        dialog.resizable(False, False)
-        
-        # Center dialog on screen
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (350 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (200 // 2)
-        dialog.geometry(f"350x200+{x}+{y}")
-        
-        # Configure dialog background
-        dialog.configure(bg='#ff8800')
-        
-        # Warning icon and message
-        main_frame = tk.Frame(dialog, bg='#ff8800')
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Warning icon
-        tk.Label(main_frame, text="⚠️", font=("Arial", 32), 
-                bg='#ff8800', fg='white').pack(pady=10)
-        
-        # Warning message
-        tk.Label(main_frame, text="ALREADY CHECKED OUT", 
-                font=("Arial", 14, "bold"), bg='#ff8800', fg='white').pack()
-        
-        tk.Label(main_frame, text=f"{employee_name} (ID: {nric})", 
-                font=("Arial", 12), bg='#ff8800', fg='white').pack(pady=5)
-        
-        tk.Label(main_frame, text="Employee is already in checked out status", 
-                font=("Arial", 10), bg='#ff8800', fg='white').pack(pady=5)
-        
-        # Close function to resume camera
-        def close_dialog():
-            dialog.destroy()
-            self.resume_camera_after_popup()
-        
-        # OK button
-        ok_button = tk.Button(main_frame, text="OK", font=("Arial", 12, "bold"),
-                             command=close_dialog, width=10,
-                             bg='white', fg='#ff8800', relief='raised', bd=2)
-        ok_button.pack(pady=15)
-        ok_button.focus_set()
-        
-        # Bind Enter and Escape keys
-        dialog.bind('<Return>', lambda e: close_dialog())
-        dialog.bind('<Escape>', lambda e: close_dialog())
+        # One hidden popup per size is built on first use, then recolored and re-texted
+        popup = self._notification_dialogs.get(size)
+        if popup is None or not popup['dialog'].winfo_exists():
+            popup = self._build_notification_dialog(*size)
+            self._notification_dialogs[size] = popup
+        
+        dialog = popup['dialog']
+        dialog.title(title)
+        for widget in (dialog, popup['frame'], popup['icon'], popup['header'], popup['details']):
+            widget.configure(bg=bg_color)
+        popup['ok_button'].configure(fg=bg_color)
+        
+        popup['icon'].configure(text=icon)
+        popup['header'].configure(text=header)
+        popup['details'].configure(text=details)
+        
+        # Only show the details line when there is something to say
+        if details:
+            popup['details'].pack(pady=5, before=popup['ok_button'])
+        else:
+            popup['details'].pack_forget()
         
-        # Auto-close after 5 seconds
-        dialog.after(5000, close_dialog)
+        self._show_pooled_dialog(dialog, popup['ok_button'], auto_close_ms)
     
-    def show_group_error_notification(self, employee_name, nric, error_type, additional_info=""):
-        """Show detailed error notification for group check scenarios"""
-        # Define error configurations
-        error_configs = {
-            'not_clocked_in': {
-                'title': 'Cannot Add to Group',
-                'header': 'NOT CLOCKED IN',
-                'icon': '❌',
-                'bg_color': '#ff4444',
-                'description': 'Employee has not clocked in today'
-            },
-            'already_checked_out': {
-                'title': 'Cannot Add to Group', 
-                'header': 'ALREADY CHECKED OUT',
-                'icon': '⚠️',
-                'bg_color': '#ff8800',
-                'description': 'Employee is already in checked out status'
-            },
-            'not_in_check_window': {
-                'title': 'Cannot Add to Group',
-                'header': 'OUTSIDE CHECK WINDOW',
-                'icon': '🕐',
-                'bg_color': '#ff6600',
-                'description': 'Current time is outside the allowed check window'
-            },
-            'already_in_group': {
-                'title': 'Cannot Add to Group',
-                'header': 'ALREADY IN GROUP',
-                'icon': '✅',
-                'bg_color': '#3399ff',
-                'description': 'Employee is already added to the group list'
-            },
-            'final_clock_out': {
-                'title': 'Cannot Add to Group',
-                'header': 'ALREADY CLOCKED OUT',
-                'icon': '🔒',
-                'bg_color': '#666666',
-                'description': 'Employee has completed final clock out for today'
-            }
-        }
-        
-        config = error_configs.get(error_type, error_configs['not_clocked_in'])
-        
-        # Pause camera when popup appears
-        self.pause_camera_for_popup()
-        
+    def _build_notification_dialog(self, width, height):
+        """Create a hidden notification popup; colors and text are set per notification"""
         dialog = tk.Toplevel(self.root)
-        dialog.title(config['title'])
-        dialog.geometry("400x250")
         dialog.transient(self.root)
-        dialog.grab_set()
         dialog.resizable(False, False)
         
         # Center dialog on screen
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (400 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (250 // 2)
-        dialog.geometry(f"400x250+{x}+{y}")
-        
-        # Configure dialog background
-        dialog.configure(bg=config['bg_color'])
+        self._center_dialog(dialog, width, height)
         
         # Main frame
-        main_frame = tk.Frame(dialog, bg=config['bg_color'])
+        main_frame = tk.Frame(dialog)
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Icon
-        tk.Label(main_frame, text=config['icon'], font=("Arial", 36), 
-                bg=config['bg_color'], fg='white').pack(pady=10)
+        icon_label = tk.Label(main_frame, font=("Arial", 32), fg='white')
+        icon_label.pack(pady=10)
         
         # Header message
-        tk.Label(main_frame, text=config['header'], 
-                font=("Arial", 14, "bold"), bg=config['bg_color'], fg='white').pack()
-        
-        # Employee info
-        tk.Label(main_frame, text=f"{employee_name}", 
-                font=("Arial", 13, "bold"), bg=config['bg_color'], fg='white').pack(pady=5)
-        
-        tk.Label(main_frame, text=f"ID: {nric}", 
-                font=("Arial", 12), bg=config['bg_color'], fg='white').pack()
-        
-        # Description
-        tk.Label(main_frame, text=config['description'], 
-                font=("Arial", 11), bg=config['bg_color'], fg='white').pack(pady=10)
-        
-        # Additional info if provided
-        if additional_info:
-            tk.Label(main_frame, text=additional_info, 
-                    font=("Arial", 10), bg=config['bg_color'], fg='white').pack(pady=5)
+        header_label = tk.Label(main_frame, font=("Arial", 14, "bold"), fg='white',
+                                wraplength=width - 60, justify="center")
+        header_label.pack()
         
-        # Close function to resume camera
-        def close_dialog():
-            dialog.destroy()
-            self.resume_camera_after_popup()
+        # Employee info / description (packed only when used)
+        details_label = tk.Label(main_frame, font=("Arial", 11), fg='white', justify="center")
         
         # OK button
         ok_button = tk.Button(main_frame, text="OK", font=("Arial", 12, "bold"),
-                             command=close_dialog, width=10,
-                             bg='white', fg=config['bg_color'], relief='raised', bd=2)
+                             command=lambda: self._hide_pooled_dialog(dialog), width=10,
+                             bg='white', relief='raised', bd=2)
         ok_button.pack(pady=15)
-        ok_button.focus_set()
         
         # Bind Enter and Escape keys
-        dialog.bind('<Return>', lambda e: close_dialog())
-        dialog.bind('<Escape>', lambda e: close_dialog())
-        
-        # Auto-close after 5 seconds
-        dialog.after(5000, close_dialog)
-    
+        dialog.bind('<Return>', lambda e: self._hide_pooled_dialog(dialog))
+        dialog.bind('<Escape>', lambda e: self._hide_pooled_dialog(dialog))
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self._hide_pooled_dialog(dialog))
+        
+        dialog.withdraw()
+        return {
+            'dialog': dialog,
+            'frame': main_frame,
+            'icon': icon_label,
+            'header': header_label,
+            'details': details_label,
+            'ok_button': ok_button,
+        }
 
+    def show_already_checked_out_dialog(self, employee_name, nric):
+        """Show error dialog for employee already checked out"""
+        self._show_notification(
+            "Already Checked Out", '#ff8800', "⚠️", "ALREADY CHECKED OUT",
+            f"{employee_name} (ID: {nric})\nEmployee is already in checked out status", size=(350, 200)
+        )
     
-
+    def show_group_error_notification(self, employee_name, nric, error_type, additional_info=""):
+        """Show detailed error notification for group check scenarios"""
+        config = _GROUP_ERROR_CONFIGS.get(error_type, _GROUP_ERROR_CONFIGS['not_clocked_in'])
+        
+        # Employee info, description and any additional info share one label
+        details = f"{employee_name}\nID: {nric}\n\n{config['description']}"
+        if additional_info:
+            details += f"\n{additional_info}"
+        
+        self._show_notification(config['title'], config['bg_color'], config['icon'], config['header'], details)
     
     def show_temp_message(self, message, color, parent_dialog=None):
-
+        """Show a temporary message dialog"""
         if parent_dialog is not None:
             try:
                 parent_dialog.destroy()
             except:
                 pass
-    
-        """Show a temporary message dialog"""
-        # Pause camera when popup appears
-        self.pause_camera_for_popup()
-        
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Information")
-        dialog.geometry("350x180")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        dialog.resizable(False, False)
-        
-        # Center dialog on screen
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (350 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (180 // 2)
-        dialog.geometry(f"350x180+{x}+{y}")
         
-        # Configure dialog background based on color
+        # Configure dialog background and icon based on color
         bg_color = '#ff8800' if color == 'orange' else '#ff4444'
-        dialog.configure(bg=bg_color)
-        
-        # Message frame
-        main_frame = tk.Frame(dialog, bg=bg_color)
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Icon based on color
         icon = "⚠️" if color == 'orange' else "❌"
-        tk.Label(main_frame, text=icon, font=("Arial", 32), 
-                bg=bg_color, fg='white').pack(pady=10)
-        
-        # Message
-        tk.Label(main_frame, text=message, 
-                font=("Arial", 12, "bold"), bg=bg_color, fg='white').pack(pady=5)
-        
-        # Close function to resume camera
-        def close_dialog():
-            dialog.destroy()
-            self.resume_camera_after_popup()
-        
-        # OK button
-        ok_button = tk.Button(main_frame, text="OK", font=("Arial", 12, "bold"),
-                             command=close_dialog, width=10,
-                             bg='white', fg=bg_color, relief='raised', bd=2)
-        ok_button.pack(pady=15)
-        ok_button.focus_set()
-        
-        # Bind Enter and Escape keys
-        dialog.bind('<Return>', lambda e: close_dialog())
-        dialog.bind('<Escape>', lambda e: close_dialog())
-
-        dialog.focus_set()
         
         # Auto-close after 3 seconds
-        dialog.after(3000, close_dialog)
-    
-
+        self._show_notification("Information", bg_color, icon, message, auto_close_ms=3000, size=(350, 180))
     
     # DEPRECATED: QR codes now process directly without confirmation
     # def show_qr_recognition_confirmation(self, qr_code, employee):
@@ -1513,142 +1624,64 @@ class SimpleKioskApp:
     def show_face_recognition_confirmation(self, face, employee):
         """Show confirmation dialog for face recognition"""
         try:
-            print(f"[CONFIRMATION DEBUG] Starting face confirmation dialog for {employee['name']}")
+            logger.debug("[CONFIRMATION DEBUG] Starting face confirmation dialog for %s", employee['name'])
             
             # Play detection beep when face is recognized
             self.play_scan_detected_beep()
             
             # Turn OFF camera after recognition (manual mode)
             self.stop_camera()
-            print(f"[CONFIRMATION DEBUG] Camera turned OFF after face recognition")
-            
-            # Create custom dialog for larger size and font
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Confirm Face Recognition")
-            dialog.transient(self.root)  # Set to be on top of main window
-            dialog.grab_set()  # Modal dialog
-            
-            # Make dialog larger
-            dialog_width = 600
-            dialog_height = 500
-            dialog.geometry(f"{dialog_width}x{dialog_height}")
-            dialog.resizable(True, True)
+            logger.debug("[CONFIRMATION DEBUG] Camera turned OFF after face recognition")
             
-            # Center the dialog on screen
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            x = (screen_width - dialog_width) // 2
-            y = (screen_height - dialog_height) // 2
-            dialog.geometry(f"+{x}+{y}")
-            
-            # Configure font sizes
-            text_font = ("Arial", 14)
-            button_font = ("Arial", 12, "bold")
+            # Build the dialog once and reuse it for every confirmation
+            if self._fc_dialog is None or not self._fc_dialog.winfo_exists():
+                self._build_face_confirmation_dialog()
             
             # Create dialog content
             employee_role = employee.get('roles', [])
             role_icon = '🛡️' if employee_role == 'Security' else '👥'
             confidence = face.get('confidence', 0.0) * 100
             
-            # Main frame with padding
-            main_frame = tk.Frame(dialog, padx=20, pady=20)
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Recognition details in a frame
-            details_frame = tk.Frame(main_frame)
-            details_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-            
             # Employee details with larger font
             details_text = f"Recognized: {face['name']}\n\n"
             details_text += f"Employee ID: {face['nric']}\n\n"
             details_text += f"Role: {role_icon} {employee_role}\n\n"
             details_text += f"Confidence: {confidence:.2f}%"
+            self._fc_details_lbl.configure(text=details_text)
             
-            details_label = tk.Label(
-                details_frame,
-                text=details_text,
-                font=text_font,
-                justify=tk.LEFT,
-                pady=20
-            )
-            details_label.pack()
-            
-            # Question
-            question_label = tk.Label(
-                main_frame,
-                text="Is this recognition correct?",
-                font=text_font,
-                fg="#e74c3c",
-                pady=10
-            )
-            question_label.pack()
-            
-            # Button frame
-            button_frame = tk.Frame(main_frame)
-            button_frame.pack(pady=20)
+            # Return straight away; the YES/NO handler continues in _handle_face_confirmation
+            # so the Tk loop keeps servicing timers and audio while the dialog is up
+            self._fc_on_result = lambda result: self._handle_face_confirmation(face, employee, result)
             
-            # Store the result
-            self.confirmation_result = None
-            
-            def on_yes():
-                self.confirmation_result = True
-                dialog.destroy()
+            dialog = self._fc_dialog
+            dialog.deiconify()
+            dialog.lift()
+            dialog.grab_set()  # Modal dialog
+            self._fc_yes.focus_set()
                 
-            def on_no():
-                self.confirmation_result = False
-                dialog.destroy()
-            
-            # Yes button (green)
-            yes_button = tk.Button(
-                button_frame,
-                text="✓ YES - Correct",
-                font=button_font,
-                bg="#27ae60",
-                fg="white",
-                padx=30,
-                pady=10,
-                command=on_yes
-            )
-            yes_button.pack(side=tk.LEFT, padx=20)
-            
-            # No button (red)
-            no_button = tk.Button(
-                button_frame,
-                text="✗ NO - Try Again",
-                font=button_font,
-                bg="#e74c3c",
-                fg="white",
-                padx=30,
-                pady=10,
-                command=on_no
-            )
-            no_button.pack(side=tk.LEFT, padx=20)
-            
-            # Make buttons focusable and bind Enter/Escape keys
-            yes_button.focus_set()
-            dialog.bind('<Return>', lambda e: on_yes())
-            dialog.bind('<Escape>', lambda e: on_no())
-            
-            # Wait for dialog to close
-            self.root.wait_window(dialog)
-            
-            # Process result after dialog closes
-            result = self.confirmation_result
-            print(f"[CONFIRMATION DEBUG] User response: {result}")
+        except Exception as e:
+            logger.exception("Error in face recognition confirmation: %s", e)
+            # Keep camera OFF in case of error - manual activation required
+            self.show_error_message("Error in face recognition confirmation\n\nPress + to try again")
+    
+    def _handle_face_confirmation(self, face, employee, result):
+        """Process the user's answer to the face recognition confirmation dialog"""
+        try:
+            logger.debug("[CONFIRMATION DEBUG] User response: %s", result)
             
             # Process result
             if result:
                 # User confirmed - process attendance
                 success, message = self.process_attendance_with_location_check(
-                    face['nric'], "face_recognition"
+                    face['nric'], "face_recognition", employee
                 )
                 
                 if success:
-                    print(f"[FACE DEBUG] Attendance success: {message}")
+                    logger.debug("[FACE DEBUG] Attendance success: %s", message)
                     if message != "Location selection initiated":
                         self.show_success_message(f"✓ {employee['name']} - {message}")
                 else:
-                    print(f"[FACE DEBUG] Attendance failed: {message}")
+                    logger.warning("[FACE DEBUG] Attendance failed: %s", message)
                     
                     # Check if this is an early clock-out error
                     if self.is_early_clockout_error(message):
@@ -1657,23 +1690,116 @@ class SimpleKioskApp:
                         self.show_error_message(f"✗ {message}")
                 
                 # Keep camera OFF after successful processing
-                print(f"[CONFIRMATION DEBUG] Keeping camera OFF after successful face processing")
+                logger.debug("[CONFIRMATION DEBUG] Keeping camera OFF after successful face processing")
                 
             else:
                 # User rejected - keep camera OFF, let them manually try again
-                print(f"[FACE DEBUG] Recognition rejected by user: {face['name']}")
+                logger.debug("[FACE DEBUG] Recognition rejected by user: %s", face['name'])
                 
                 self.show_error_message("❌ Face recognition rejected\n\nPress + to try recognition again")
                 
                 # Keep camera OFF - employee must manually press + to try again
-                print(f"[CONFIRMATION DEBUG] Camera remains OFF - manual activation required for retry")
+                logger.debug("[CONFIRMATION DEBUG] Camera remains OFF - manual activation required for retry")
                 
         except Exception as e:
-            print(f"Error in face recognition confirmation: {e}")
-            print(f"[CONFIRMATION DEBUG] Exception traceback: {traceback.format_exc()}")
+            logger.exception("Error in face recognition confirmation: %s", e)
             # Keep camera OFF in case of error - manual activation required
             self.show_error_message("Error in face recognition confirmation\n\nPress + to try again")
 
+    def _build_face_confirmation_dialog(self):
+        """Create the hidden face recognition confirmation dialog"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Confirm Face Recognition")
+        dialog.transient(self.root)  # Set to be on top of main window
+        
+        # Make dialog larger
+        dialog_width = 600
+        dialog_height = 500
+        dialog.resizable(True, True)
+        
+        # Size and center the dialog on screen
+        self._center_dialog(dialog, dialog_width, dialog_height)
+        
+        # Configure font sizes
+        text_font = ("Arial", 14)
+        button_font = ("Arial", 12, "bold")
+        
+        # Main frame with padding
+        main_frame = tk.Frame(dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Recognition details in a frame
+        details_frame = tk.Frame(main_frame)
+        details_frame.pack(fill=tk.BOTH, expand=True, pady=20)
+        
+        details_label = tk.Label(
+            details_frame,
+            text="",
+            font=text_font,
+            justify=tk.LEFT,
+            pady=20
+        )
+        details_label.pack()
+        
+        # Question
+        question_label = tk.Label(
+            main_frame,
+            text="Is this recognition correct?",
+            font=text_font,
+            fg="#e74c3c",
+            pady=10
+        )
+        question_label.pack()
+        
+        # Button frame
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(pady=20)
+        
+        def answer_with(result):
+            dialog.grab_release()
+            dialog.withdraw()
+            # Hand the answer to the pending confirmation (only once per showing)
+            on_result, self._fc_on_result = self._fc_on_result, None
+            if on_result is not None:
+                on_result(result)
+        
+        # Yes button (green)
+        yes_button = tk.Button(
+            button_frame,
+            text="✓ YES - Correct",
+            font=button_font,
+            bg="#27ae60",
+            fg="white",
+            padx=30,
+            pady=10,
+            command=lambda: answer_with(True)
+        )
+        yes_button.pack(side=tk.LEFT, padx=20)
+        
+        # No button (red)
+        no_button = tk.Button(
+            button_frame,
+            text="✗ NO - Try Again",
+            font=button_font,
+            bg="#e74c3c",
+            fg="white",
+            padx=30,
+            pady=10,
+            command=lambda: answer_with(False)
+        )
+        no_button.pack(side=tk.LEFT, padx=20)
+        
+        # Bind Enter/Escape keys once
+        dialog.bind('<Return>', lambda e: answer_with(True))
+        dialog.bind('<Escape>', lambda e: answer_with(False))
+        dialog.protocol("WM_DELETE_WINDOW", lambda: answer_with(False))
+        
+        dialog.withdraw()
+        self._fc_dialog = dialog
+        self._fc_details_lbl = details_label
+        self._fc_yes = yes_button
+        self._fc_no = no_button
+
     def show_success_message(self, message):
         """Show success message"""
         self.message_frame.pack(fill="x", padx=30, pady=10)
@@ -1684,7 +1810,7 @@ class SimpleKioskApp:
         self.update_attendance_history()
         
         # Auto-hide after timeout
-        self.root.after(self.auto_timeout * 1000, self.clear_message)
+        self._schedule_clear_message()
     
     def show_error_message(self, message):
         """Show error message"""
@@ -1693,123 +1819,140 @@ class SimpleKioskApp:
         self.status_label.configure(text="● ERROR", text_color="red")
         
         # Auto-hide after timeout
-        self.root.after(self.auto_timeout * 1000, self.clear_message)
+        self._schedule_clear_message()
     
     def show_auto_dismiss_error(self, message, dismiss_after=3):
         """Show auto-dismissing error popup window for face recognition errors"""
         # Pause camera when popup appears
         self.pause_camera_for_popup()
         
+        # Borderless, topmost and non-modal: built once, then re-texted and re-shown
+        if self._error_popup is None or not self._error_popup.winfo_exists():
+            self._build_error_popup()
+        
+        error_popup = self._error_popup
+        self._error_message_label.configure(text=message)
+        
+        # Size to the content (at least 400x200) and center over the main window
+        error_popup.update_idletasks()
+        popup_width = max(400, error_popup.winfo_reqwidth())
+        popup_height = max(200, error_popup.winfo_reqheight())
+        x = self.root.winfo_rootx() + (self.root.winfo_width() - popup_width) // 2
+        y = self.root.winfo_rooty() + (self.root.winfo_height() - popup_height) // 2
+        error_popup.geometry(f"{popup_width}x{popup_height}+{x}+{y}")
+        error_popup.deiconify()
+        error_popup.lift()
+        
+        # Auto-dismiss with a single timer (restarted if the popup is already showing)
+        after_id = self._dialog_after_ids.pop(error_popup, None)
+        if after_id:
+            error_popup.after_cancel(after_id)
+        self._dialog_after_ids[error_popup] = error_popup.after(dismiss_after * 1000, self._dismiss_error_popup)
+    
+    def _build_error_popup(self):
+        """Create the hidden auto-dismiss error popup"""
         error_popup = ctk.CTkToplevel(self.root)
         error_popup.title("Error")
-        error_popup.geometry("400x200")
         error_popup.transient(self.root)
         error_popup.attributes('-topmost', True)
         
         error_popup.overrideredirect(True)  # This removes title bar completely
         
-        popup_width = 400
-        popup_height = 200
-        x = self.root.winfo_rootx() + (self.root.winfo_width() - popup_width) // 2
-        y = self.root.winfo_rooty() + (self.root.winfo_height() - popup_height) // 2
-        error_popup.geometry(f"{popup_width}x{popup_height}+{x}+{y}")
-        
         # Error content
         error_frame = ctk.CTkFrame(error_popup, fg_color="transparent")
         error_frame.pack(expand=True, fill="both", padx=20, pady=20)
         
         # Error icon
-        icon_label = ctk.CTkLabel(
+        ctk.CTkLabel(
             error_frame,
             text="⚠️",
             font=ctk.CTkFont(size=48)
-        )
-        icon_label.pack(pady=(10, 10))
+        ).pack(pady=(10, 10))
         
         # Error message
-        message_label = ctk.CTkLabel(
+        self._error_message_label = ctk.CTkLabel(
             error_frame,
-            text=message,
+            text="",
             font=ctk.CTkFont(size=16),
             text_color="red",
             wraplength=350
         )
-        message_label.pack(pady=10)
+        self._error_message_label.pack(pady=10)
         
-        # Countdown label
-        countdown_label = ctk.CTkLabel(
+        # Dismiss hint (static: the popup closes on a single timer, there is no countdown)
+        ctk.CTkLabel(
             error_frame,
-            text=f"Closing in {dismiss_after} seconds...",
+            text="Closing shortly...",
             font=ctk.CTkFont(size=12),
             text_color="gray"
-        )
-        countdown_label.pack(pady=(10, 0))
-        
-        # Auto-dismiss countdown
-        def countdown(remaining):
-            if remaining > 0:
-                countdown_label.configure(text=f"Closing in {remaining} seconds...")
-                error_popup.after(1000, lambda: countdown(remaining - 1))
-            else:
-                error_popup.destroy()
-                # Resume camera after popup closes
-                self.resume_camera_after_popup()
+        ).pack(pady=(10, 0))
         
-        countdown(dismiss_after)
+        error_popup.withdraw()
+        self._error_popup = error_popup
+    
+    def _dismiss_error_popup(self):
+        """Hide the auto-dismiss error popup and resume the camera"""
+        self._dialog_after_ids.pop(self._error_popup, None)
+        self._error_popup.withdraw()
+        # Resume camera after popup closes
+        self.resume_camera_after_popup()
     
     def play_scan_detected_beep(self):
         """Play quick beep when face or QR is detected (before processing)"""
         if not self.audio_enabled or not AUDIO_AVAILABLE:
             return
         
-        def play_audio():
-            try:
-                if PYGAME_AVAILABLE:
-                    # Try to play MP3 file using pygame
-                    if os.path.exists("scan.mp3"):
-                        sound = pygame.mixer.Sound("scan.mp3")
-                        sound.play()
-                        print("[AUDIO] Playing scan.mp3 via pygame (detection)")
-                    else:
-                        print("[AUDIO] scan.mp3 not found, falling back to beep")
-                        # Fallback to system beep if MP3 not found
-                        if WINSOUND_AVAILABLE:
-                            winsound.Beep(600, 100)
-                        else:
-                            os.system('echo \a')
-                elif WINSOUND_AVAILABLE:
-                    # Fallback to winsound beep
-                    winsound.Beep(600, 100)
-                    print("[AUDIO] Playing detection beep via winsound")
+        # Hand off to the audio worker to avoid blocking UI
+        self._audio_q.put_nowait("scan")
+    
+    def _audio_worker(self):
+        """Play queued sounds one at a time on a single background thread"""
+        while True:
+            sound_name = self._audio_q.get()
+            if sound_name == "scan":
+                self._play_scan_sound()
+    
+    def _play_scan_sound(self):
+        """Play the detection sound (runs on the audio worker thread)"""
+        try:
+            if PYGAME_AVAILABLE:
+                # Play the preloaded MP3 using pygame
+                if self._scan_sound is not None:
+                    self._scan_sound.play()
+                    logger.debug("[AUDIO] Playing scan.mp3 via pygame (detection)")
                 else:
-                    # Final fallback to system beep
-                    os.system('echo \a')
-                    print("[AUDIO] Playing system detection beep")
-            except Exception as e:
-                print(f"[AUDIO] Error playing detection beep: {e}")
-                # Emergency fallback
-                try:
-                    os.system('echo \a')
-                except:
-                    pass
-        
-        # Play audio in background thread to avoid blocking UI
-        threading.Thread(target=play_audio, daemon=True).start()
+                    logger.debug("[AUDIO] scan.mp3 not available, falling back to beep")
+                    # Fallback to system beep if MP3 not found
+                    if WINSOUND_AVAILABLE:
+                        winsound.Beep(600, 100)
+                    else:
+                        os.system('echo \a')
+            elif WINSOUND_AVAILABLE:
+                # Fallback to winsound beep
+                winsound.Beep(600, 100)
+                logger.debug("[AUDIO] Playing detection beep via winsound")
+            else:
+                # Final fallback to system beep
+                os.system('echo \a')
+                logger.debug("[AUDIO] Playing system detection beep")
+        except Exception as e:
+            logger.error("[AUDIO] Error playing detection beep: %s", e)
+            # Emergency fallback
+            try:
+                os.system('echo \a')
+            except:
+                pass
     
     def show_early_clockout_error(self, employee_name, min_time, shift_name):
         """Show dedicated error dialog for early clock-out attempts"""
         # Create a modal dialog
         dialog = ctk.CTkToplevel(self.root)
         dialog.title("Clock-Out Restricted")
-        dialog.geometry("500x300")
         dialog.transient(self.root)
         dialog.grab_set()
         
         # Center the dialog
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (500 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (300 // 2)
-        dialog.geometry(f"500x300+{x}+{y}")
+        self._center_dialog(dialog, 500, 300)
         
         # Configure dialog
         dialog.configure(fg_color=("gray90", "gray10"))
@@ -1877,14 +2020,13 @@ class SimpleKioskApp:
     
     def is_early_clockout_error(self, message):
         """Check if error message is about early clock-out"""
-        return "Cannot clock out before" in message
+        return message.startswith(_EARLY_CLOCKOUT_PREFIX)
     
     def handle_early_clockout_error(self, employee_name, message):
         """Handle early clock-out error with custom dialog"""
         # Parse the error message to extract time and shift info
         # Message format: "Cannot clock out before 5:00 PM (Early Shift)"
-        import re
-        match = re.search(r'Cannot clock out before (\d{1,2}:\d{2} [AP]M) \(([^)]+)\)', message)
+        match = _EARLY_CLOCKOUT_RE.match(message)  # Only called for messages starting with the prefix
         
         if match:
             min_time = match.group(1)
@@ -1897,8 +2039,15 @@ class SimpleKioskApp:
         # Show the custom dialog
         self.show_early_clockout_error(employee_name, min_time, shift_name)
     
+    def _schedule_clear_message(self):
+        """(Re)start the status message auto-hide timer so only the newest message's timer is pending"""
+        if self._message_after_id:
+            self.root.after_cancel(self._message_after_id)
+        self._message_after_id = self.root.after(self.auto_timeout * 1000, self.clear_message)
+    
     def clear_message(self):
         """Clear status message"""
+        self._message_after_id = None
         self.message_frame.pack_forget()
         self.status_label.configure(
             text="Please position yourself in front of the camera",
@@ -1907,132 +2056,148 @@ class SimpleKioskApp:
     
     def load_known_faces(self):
         """Load known faces from database (now using face vectors)"""
-        print("[FACE DEBUG] Loading known faces from database...")
-        
-        # Try to load face vectors first (new method)
-        employees_with_vectors = self.db.get_all_face_vectors()
+        logger.debug("[FACE DEBUG] Loading known faces from database...")
+        self._role_cache.clear()
+        self._employee_cache.clear()
+        
+        # Pass the database manager; face vectors are fetched and decoded off the UI thread
+        future = self._face_load_executor.submit(self.face_recognition.load_known_faces, self.db)
+        self.root.after(50, lambda: self._poll_faces_loaded(future))
+    
+    def _poll_faces_loaded(self, future):
+        """Wait for a background load_known_faces without blocking the Tk loop, then report it"""
+        if not future.done():
+            self.root.after(50, lambda: self._poll_faces_loaded(future))
+            return
+        try:
+            future.result()
+        except Exception as e:
+            logger.error("[FACE DEBUG] Error loading known faces: %s", e)
         
-        if employees_with_vectors:
-            print(f"[FACE DEBUG] Found {len(employees_with_vectors)} employees with face vectors")
-            for emp in employees_with_vectors:
-                print(f"[FACE DEBUG] - {emp['name']} ({emp['nric']}): Vector loaded")
-            # Pass the database manager instead of the list
-            self.face_recognition.load_known_faces(self.db)
+        face_count = len(self.face_recognition.known_faces)
+        if face_count:
+            logger.debug("[FACE DEBUG] Loaded face vectors for %s employees", face_count)
         else:
-            print("[FACE DEBUG] No face vectors found")
-    
-    def convert_and_load_legacy_faces(self, employees_with_faces):
-        """Convert legacy face images to vectors on-the-fly (for backward compatibility)"""
-        converted_employees = []
-        
-        for emp in employees_with_faces:
-            try:
-                # Load the image file and extract embedding
-                import cv2
-                img = cv2.imread(emp['face_image_path'])
-                if img is not None:
-                    face_vector, _ = self.face_recognition.extract_face_embedding_hybrid(img)
-                    if face_vector is not None:
-                        converted_employees.append({
-                            'nric': emp['nric'],
-                            'name': emp['name'],
-                            'face_vector': face_vector
-                        })
-                        print(f"[FACE DEBUG] ✓ Converted {emp['name']} image to vector")
-                    else:
-                        print(f"[FACE DEBUG] ✗ Failed to extract face from {emp['name']} image")
-                else:
-                    print(f"[FACE DEBUG] ✗ Could not load image file for {emp['name']}")
-            except Exception as e:
-                print(f"[FACE DEBUG] ✗ Failed to convert {emp['name']} image: {e}")
-        
-        if converted_employees:
-            # Store converted employees in database first, then load them properly
-            for emp in converted_employees:
-                # Convert and save each employee's face vector
-                try:
-                    success = self.db.add_employee_with_face_vector(
-                        nric=emp['nric'],
-                        name=emp['name'],
-                        face_vector=emp['face_vector'],
-                        department=emp.get('department', 'Unknown')
-                    )
-                    if success:
-                        print(f"[FACE DEBUG] ✓ Migrated {emp['name']} to vector format")
-                except Exception as e:
-                    print(f"[FACE DEBUG] ✗ Failed to migrate {emp['name']}: {e}")
-            
-            # Now load from database properly
-            self.face_recognition.load_known_faces(self.db)
+            logger.debug("[FACE DEBUG] No face vectors found")
     
     def update_attendance_history(self):
         """Update the unified attendance history display"""
         # Use the unified history frame
         history_frame = self.unified_history_frame
         
-        # Clear existing history
-        for widget in history_frame.winfo_children():
-            widget.destroy()
+        # Get today's attendance (all types - clock and check); the query already limits to today
+        unified_records = self.db.get_attendance_today()
         
-        # Get today's attendance with explicit date check
-        attendance_records = self.db.get_attendance_today()
-        
-        # Filter for today's records (all types - clock and check)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        unified_records = []
-        for record in attendance_records:
-            record_date = record['timestamp'][:10]  # Extract YYYY-MM-DD part
-            if record_date == current_date:
-                unified_records.append(record)
+        # Skip the rebuild when nothing shown in the panel has changed since the last render
+        history_hash = hash(tuple((r['nric'], self._record_display_key(r)) for r in unified_records))
+        if history_hash == self._last_history_hash:
+            return
+        self._last_history_hash = history_hash
         
         if not unified_records:
-            no_records_label = ctk.CTkLabel(
+            # Clear existing history (sections go back to the pool for reuse)
+            for section in self._history_sections.values():
+                self._recycle_history_section(section)
+            self._history_sections.clear()
+            if self._history_empty_label is not None:
+                self._history_empty_label.destroy()
+            
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            self._history_empty_label = ctk.CTkLabel(
                 history_frame,
                 text=f"No attendance records for {current_date}",
                 font=ctk.CTkFont(size=16),
                 text_color="gray"
             )
-            no_records_label.pack(pady=20)
+            self._history_empty_label.pack(pady=20)
             return
         
-        # Group records by employee and keep all records (both clock and check)
-        employee_records = {}
-        for record in unified_records:  # Use all filtered records
-            emp_id = record['nric']
-            if emp_id not in employee_records:
-                # Get employee info from database to include role
-                employee_info = self.db.get_employee(emp_id)
-                role = employee_info.get('role', 'Staff') if employee_info else 'Staff'
-                
-                employee_records[emp_id] = {
-                    'name': record['name'],
-                    'role': role,
-                    'records': []
-                }
-            employee_records[emp_id]['records'].append(record)
-        
-        # Sort records by time for each employee (newest first)
-        for emp_id in employee_records:
-            employee_records[emp_id]['records'].sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Display all records for each employee
-        for emp_id, data in employee_records.items():
-            self.create_employee_history_section_unified(emp_id, data, history_frame)
+        if self._history_empty_label is not None:
+            self._history_empty_label.destroy()
+            self._history_empty_label = None
+        
+        # Group records by employee and keep all records (both clock and check).
+        # The query already sorts newest first, so each group keeps that order without re-sorting
+        records_by_nric = defaultdict(list)
+        for record in unified_records:
+            records_by_nric[record['nric']].append(record)
+        
+        # Drop sections for employees no longer in today's records
+        for emp_id in self._history_sections.keys() - records_by_nric.keys():
+            self._recycle_history_section(self._history_sections.pop(emp_id))
+        
+        # Create sections for new employees; existing sections only get their changed rows updated
+        ordered_frames = []
+        for emp_id, records in records_by_nric.items():
+            section = self._history_sections.get(emp_id)
+            if section is None:
+                data = {'name': records[0]['name'], 'role': self._get_role(emp_id), 'records': records}
+                section = self.create_employee_history_section_unified(emp_id, data, history_frame)
+                self._history_sections[emp_id] = section
+            else:
+                self._update_history_section(section, records)
+            ordered_frames.append(section['frame'])
+        
+        # Re-pack in display order (most recent activity first) when it changed;
+        # pack_forget keeps the widgets alive
+        if ordered_frames != history_frame.pack_slaves():
+            for frame in ordered_frames:
+                frame.pack_forget()
+            for frame in ordered_frames:
+                frame.pack(fill="x", padx=8, pady=12)
+    
+    def _get_role(self, nric):
+        """Get an employee's role for display, looking it up in the database only on a cache miss"""
+        role = self._role_cache.get(nric)
+        if role is None:
+            employee_info = self.db.get_employee(nric)
+            role = employee_info.get('role', 'Staff') if employee_info else 'Staff'
+            self._role_cache[nric] = role
+        return role
+    
+    def _get_cached_employee(self, nric):
+        """Get an employee record for a recognized face, querying the database only on a cache miss
+        (unknown NRICs are cached too, so they are not looked up every frame)"""
+        try:
+            return self._employee_cache[nric]
+        except KeyError:
+            employee = self._employee_cache[nric] = self.db.get_employee(nric)
+            return employee
     
     def create_employee_history_section_unified(self, nric, data, history_frame):
         """Create a section showing all attendance records for one employee in unified view"""
+        # Reuse a section released by an earlier refresh when there is one
+        section = self._section_pool.pop() if self._section_pool else self._build_history_section(history_frame)
+        section['frame'].pack(fill="x", padx=8, pady=12)
+        
+        # Get role with appropriate icon
+        role = data.get('role', 'Staff')
+        section['name_label'].configure(text=f"👤 {data['name']} ({role})")
+        section['id_label'].configure(text=f"ID: {nric}")
+        
+        section['status_text'] = self._current_status_text(data['records'])
+        section['status_label'].configure(text=section['status_text'])
+        section['records_hash'] = hash(tuple(self._record_display_key(r) for r in data['records']))
+        
+        # Display each record
+        for i, record in enumerate(data['records']):
+            key = (record['id'], record.get('location_name'))
+            section['rows'][key] = self.create_record_entry_unified(record, section['records_frame'], i, section['row_pool'])
+        
+        return section
+    
+    def _build_history_section(self, history_frame):
+        """Create the (unpacked) widgets of an employee history section; texts are set per employee"""
         # Main frame for this employee - enhanced styling with purple theme for unified view
-        border_color = ("#8A2BE2", "#DDA0DD")  # BlueViolet and Plum colors
         main_frame = ctk.CTkFrame(
             history_frame, 
             border_width=2, 
-            border_color=border_color,
-            fg_color=("gray95", "gray15")
+            border_color=_HIST_BORDER_COLOR,
+            fg_color=_HIST_FG_COLOR
         )
-        main_frame.pack(fill="x", padx=8, pady=12)
         
         # Employee header - larger and more prominent
-        header_frame = ctk.CTkFrame(main_frame, fg_color=("#8A2BE2", "#663399"))  # BlueViolet and RebeccaPurple
+        header_frame = ctk.CTkFrame(main_frame, fg_color=_HIST_HEADER_COLOR)
         header_frame.pack(fill="x", padx=6, pady=6)
         
         # Employee info in horizontal layout
@@ -2043,21 +2208,18 @@ class SimpleKioskApp:
         left_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
         left_frame.pack(side="left", fill="x", expand=True)
         
-        # Get role with appropriate icon
-        role = data.get('role', 'Staff')
-        
         name_label = ctk.CTkLabel(
             left_frame,
-            text=f"👤 {data['name']} ({role})",
-            font=ctk.CTkFont(size=24, weight="bold"),
+            text="",
+            font=self._hist_name_font,
             text_color="white"
         )
         name_label.pack(anchor="w")
         
         id_label = ctk.CTkLabel(
             left_frame,
-            text=f"ID: {nric}",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            text="",
+            font=self._hist_id_font,
             text_color="white"
         )
         id_label.pack(anchor="w")
@@ -2066,31 +2228,10 @@ class SimpleKioskApp:
         right_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
         right_frame.pack(side="right")
         
-        # Get the latest record to determine current status
-        latest_record = data['records'][0] if data['records'] else None
-        
-        if latest_record:
-            attendance_type = latest_record.get('attendance_type', 'check').lower()
-            status = latest_record.get('status', 'unknown').lower()
-            
-            # Format the status text
-            if attendance_type == 'clock':
-                if status == 'in':
-                    current_status = "Clock In"
-                else:
-                    current_status = "Clock Out"
-            else:  # check
-                if status == 'in':
-                    current_status = "Check In"
-                else:
-                    current_status = "Check Out"
-        else:
-            current_status = "No Records"
-        
         status_label = ctk.CTkLabel(
             right_frame,
-            text=f"Current Status: {current_status}",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            text="",
+            font=self._hist_header_font,
             text_color="white"
         )
         status_label.pack()
@@ -2099,261 +2240,173 @@ class SimpleKioskApp:
         records_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
         records_frame.pack(fill="x", padx=8, pady=4)
         
-        # Display each record
-        for i, record in enumerate(data['records']):
-            self.create_record_entry_unified(record, records_frame, i)
+        return {
+            'frame': main_frame,
+            'name_label': name_label,
+            'id_label': id_label,
+            'status_label': status_label,
+            'status_text': "",
+            'records_frame': records_frame,
+            'rows': {},  # (record id, location) -> row frame
+            'row_pool': [],  # Hidden row frames of this section, ready for reuse
+            'records_hash': None,
+        }
+    
+    def _recycle_history_section(self, section):
+        """Hide a section and its rows and keep them for reuse instead of destroying them"""
+        section['frame'].pack_forget()
+        for row_frame in section['rows'].values():
+            row_frame.pack_forget()
+            section['row_pool'].append(row_frame)
+        section['rows'].clear()
+        self._section_pool.append(section)
     
-    def create_record_entry_unified(self, record, records_frame, index):
-        """Create a single attendance record entry for unified view - larger fonts and better spacing"""
-        # Record frame with better styling - increased height for larger fonts
-        bg_color = ("gray90", "gray20") if index % 2 == 0 else ("white", "gray25")
-        record_frame = ctk.CTkFrame(records_frame, fg_color=bg_color, height=50)
+    def _current_status_text(self, records):
+        """Header status text for an employee, from their latest record (records are newest first)"""
+        latest_record = records[0] if records else None
+        
+        if latest_record:
+            attendance_type = latest_record.get('attendance_type', 'check').lower()
+            status = latest_record.get('status', 'unknown').lower()
+            # Anything that is not a clock record counts as check, and anything not 'in' as out
+            current_status = self._STATUS_LABEL[(attendance_type == 'clock', status == 'in')]
+        else:
+            current_status = "No Records"
+        
+        return f"Current Status: {current_status}"
+    
+    @staticmethod
+    def _record_display_key(record):
+        """The record fields shown in a history row, for change detection"""
+        return (record['timestamp'], record['status'], record.get('late'),
+                record.get('overtime_hours'), record.get('location_name'))
+    
+    def _update_history_section(self, section, records):
+        """Bring an existing employee section up to date, touching only rows that changed"""
+        # Nothing to do when this employee's displayed records are the same as last time
+        records_hash = hash(tuple(self._record_display_key(r) for r in records))
+        if records_hash == section['records_hash']:
+            return
+        section['records_hash'] = records_hash
+        
+        status_text = self._current_status_text(records)
+        if status_text != section['status_text']:
+            section['status_label'].configure(text=status_text)
+            section['status_text'] = status_text
+        
+        rows = section['rows']
+        records_frame = section['records_frame']
+        keys = [(record['id'], record.get('location_name')) for record in records]
+        
+        # Remove rows that are gone (or whose location changed, since the key changes with it);
+        # their frames are kept for the next new row
+        for key in rows.keys() - set(keys):
+            row_frame = rows.pop(key)
+            row_frame.pack_forget()
+            section['row_pool'].append(row_frame)
+        
+        # Create new rows and re-stripe existing ones only when their position parity changed
+        for i, (key, record) in enumerate(zip(keys, records)):
+            row_frame = rows.get(key)
+            if row_frame is None:
+                rows[key] = self.create_record_entry_unified(record, records_frame, i, section['row_pool'])
+            elif row_frame.stripe != i % 2:
+                row_frame.configure(fg_color=_HIST_ROW_COLORS[i % 2])
+                row_frame.stripe = i % 2
+        
+        # Re-pack in record order (newest first) when it changed
+        ordered_rows = [rows[key] for key in keys]
+        if ordered_rows != records_frame.pack_slaves():
+            for row_frame in ordered_rows:
+                row_frame.pack_forget()
+            for row_frame in ordered_rows:
+                row_frame.pack(fill="x", pady=2, padx=5)
+    
+    def create_record_entry_unified(self, record, records_frame, index, row_pool=None):
+        """Create a single attendance record entry for unified view - larger fonts and better spacing.
+        A hidden row from row_pool (same parent) is reconfigured instead when one is available."""
+        if row_pool:
+            record_frame = row_pool.pop()
+            record_frame.configure(fg_color=_HIST_ROW_COLORS[index % 2])
+        else:
+            # Record frame with better styling - increased height for larger fonts
+            record_frame = ctk.CTkFrame(records_frame, fg_color=_HIST_ROW_COLORS[index % 2], height=50)
+            record_frame.pack_propagate(False)
+            
+            # Time, type, status and method share one fixed-width label; only the colored
+            # LATE/OT and location indicators get labels of their own (created when first needed)
+            record_frame.row_label = ctk.CTkLabel(record_frame, text="", font=self._hist_row_font, anchor="w")
+            record_frame.row_label.pack(side="left", padx=(12, 10), pady=8)
+            record_frame.special_label = None
+            record_frame.location_label = None
+        record_frame.stripe = index % 2
         record_frame.pack(fill="x", pady=2, padx=5)
-        record_frame.pack_propagate(False)
         
         # Parse timestamp
-        record_time = datetime.strptime(record['timestamp'], "%Y-%m-%d %H:%M:%S")
+        record_time = _parse_ts(record['timestamp'])
         time_str = record_time.strftime("%H:%M:%S")
         
-        # Status and type indicators
-        status_text = "IN" if record['status'] == 'in' else "OUT"
-        status_color = "lightgreen" if record['status'] == 'in' else "red"
-        status_icon = "⚫"
+        # Status and type indicators; the type and status are classified once per row
+        is_out = record['status'] != 'in'
+        status_text, status_color, status_icon = self._STATUS_DISPLAY_UNIFIED['out' if is_out else 'in']
         
-        attendance_type = record.get('attendance_type', 'check').upper()
-        type_color = "green" if attendance_type == 'CLOCK' else "blue"
-        type_icon = "🕐" if attendance_type == 'CLOCK' else "✅"
+        atype = record.get('attendance_type', 'check').lower()
+        attendance_type, type_color, type_icon = self._TYPE_DISPLAY.get(atype, (atype.upper(), "blue", "✅"))
+        is_clock = atype == 'clock'
         
         # Method indicator (shorter)
-        method_text = {
-            'face_recognition': '👤 Face',
-            'qr_code': '🔍 QR', 
-            'manual': '⌨️ Manual'
-        }.get(record['method'], f"📋 {record['method']}")
-        
-        # Single line layout with better proportions to fill the width
-        info_frame = ctk.CTkFrame(record_frame, fg_color="transparent")
-        info_frame.pack(fill="both", expand=True, padx=12, pady=8)
+        method_text = self._METHOD_ICONS_SHORT.get(record['method']) or f"📋 {record['method']}"
         
-        # Time (fixed width for alignment)
-        time_label = ctk.CTkLabel(
-            info_frame,
-            text=time_str,
-            font=ctk.CTkFont(size=18, weight="bold"),
-            width=120,  # Fixed width for consistent alignment
-            anchor="w"
-        )
-        time_label.pack(side="left", padx=(0, 10))
-        
-        # Create separate labels for better alignment
-        # Type label (fixed width)
-        type_label = ctk.CTkLabel(
-            info_frame,
-            text=f"{type_icon} {attendance_type}",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=type_color,
-            width=120,  # Fixed width for TYPE column
-            anchor="w"
-        )
-        type_label.pack(side="left", padx=(0, 5))
+        row_text = f"{time_str:<10}{type_icon} {attendance_type:<7}{status_icon} {status_text:<5}{method_text}"
+        record_frame.row_label.configure(text=row_text, text_color=type_color)
         
-        # Status label (fixed width)
-        status_label = ctk.CTkLabel(
-            info_frame,
-            text=f"{status_icon} {status_text}",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=type_color,
-            width=80,  # Fixed width for STATUS column
-            anchor="w"
-        )
-        status_label.pack(side="left", padx=(0, 5))
-        
-        # Special indicators (LATE/OT) with fixed width
-        special_indicator_label = ctk.CTkLabel(
-            info_frame,
-            text="",  # Default empty
-            font=ctk.CTkFont(size=16, weight="bold"),
-            width=100,  # Fixed width for special indicators
-            anchor="w"
-        )
+        # Optional indicators are re-packed in order after the main label
+        for label in (record_frame.special_label, record_frame.location_label):
+            if label is not None:
+                label.pack_forget()
         
         # Add LATE indicator with orange color
-        if record.get('late', False) and attendance_type == 'CLOCK':
-            special_indicator_label.configure(
-                text="⚠️ LATE",
-                text_color="orange"
-            )
+        overtime_hours = record.get('overtime_hours', 0)
+        if is_clock and record.get('late', False):
+            special_text, special_color = "⚠️ LATE", "orange"
         # Add OT indicator with purple color
-        elif record.get('overtime_hours', 0) > 0 and attendance_type == 'CLOCK' and status_text == 'OUT':
-            ot_hours = record.get('overtime_hours', 0)
-            special_indicator_label.configure(
-                text=f"🕐 OT {ot_hours}h",
-                text_color="purple"
-            )
-        
-        special_indicator_label.pack(side="left", padx=(0, 10))
-        
-        # Method (fixed width for alignment)
-        method_label = ctk.CTkLabel(
-            info_frame,
-            text=method_text,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            width=130,  # Fixed width for consistent alignment
-            anchor="w"
-        )
-        method_label.pack(side="left", padx=(0, 10))
+        elif is_clock and is_out and overtime_hours > 0:
+            special_text, special_color = f"🕐 OT {overtime_hours}h", "purple"
+        else:
+            special_text = None
+        
+        if special_text:
+            if record_frame.special_label is None:
+                record_frame.special_label = ctk.CTkLabel(
+                    record_frame,
+                    text="",
+                    font=self._fonts[("bold", 16)],
+                    anchor="w"
+                )
+            record_frame.special_label.configure(text=special_text, text_color=special_color)
+            record_frame.special_label.pack(side="left", padx=(0, 10), pady=8)
         
         # Location (if applicable) - fill remaining space with larger font
-        if attendance_type == 'CHECK' and status_text == 'OUT' and record.get('location_name'):
-            location_label = ctk.CTkLabel(
-                info_frame,
-                text=f"📍 {record['location_name']}",
-                font=ctk.CTkFont(size=20, weight="normal"),
-                text_color="red",
-                anchor="w"
-            )
-            location_label.pack(side="left", fill="x", expand=True)
-
-    def create_single_record_entry(self, parent, record, index):
-        """Create a single attendance record entry - enhanced for larger display"""
-        # Record frame with better styling and more space
-        bg_color = ("gray90", "gray20") if index % 2 == 0 else ("white", "gray25")
-        record_frame = ctk.CTkFrame(parent, fg_color=bg_color, height=50)
-        record_frame.pack(fill="x", pady=3, padx=5)
-        record_frame.pack_propagate(False)
-        
-        # Parse timestamp
-        record_time = datetime.strptime(record['timestamp'], "%Y-%m-%d %H:%M:%S")
-        time_str = record_time.strftime("%H:%M:%S")
-        date_str = record_time.strftime("%b %d")
-        
-        # Status indicator
-        status_text = "IN" if record['status'] == 'in' else "OUT"
-        status_color = "lightgreen" if record['status'] == 'in' else "red"
-        status_icon = "🟢" if record['status'] == 'in' else "🔴"
-        
-        # Method indicator with icons
-        method_icons = {
-            'face_recognition': 'Face Recognition',
-            'qr_code': 'QR/Barcode', 
-            'manual': 'Manual Entry'
-        }
-        method_text = method_icons.get(record['method'], f"📋 {record['method']}")
-        
-        # Create main horizontal layout with better spacing
-        info_frame = ctk.CTkFrame(record_frame, fg_color="transparent")
-        info_frame.pack(fill="both", expand=True, padx=15, pady=8)
-        
-        # Time section (left) - larger and more prominent
-        time_frame = ctk.CTkFrame(info_frame, fg_color="transparent", width=120)
-        time_frame.pack(side="left", fill="y")
-        time_frame.pack_propagate(False)
-        
-        time_label = ctk.CTkLabel(
-            time_frame,
-            text=time_str,
-            font=ctk.CTkFont(size=18, weight="bold"),
-            anchor="w"
-        )
-        time_label.pack(pady=2)
-        
-        # Status section (center) - more prominent with attendance type
-        status_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-        status_frame.pack(side="left", fill="both", expand=True, padx=20)
-        
-        # Get attendance type (default to CLOCK for existing records)
-        attendance_type = record.get('attendance_type', 'CLOCK')
-        
-        # Build status display with location for CHECK records and late indicator
-        is_late_clock_in = record.get('late', False) and attendance_type.upper() == 'CLOCK' and record['status'] == 'in'
-        
-        # Check for location text (for CHECK OUT records)
-        location_text = ""
-        if attendance_type.upper() == 'CHECK' and record['status'] == 'out':
-            location_name = record.get('location_name', '')
-            if location_name:
-                # Truncate location name if too long - set to 30 characters
-                if len(location_name) > 25:
-                    location_name = location_name[:22] + "..."
-                location_text = f"\n📍 {location_name}"
-        
-        if is_late_clock_in:
-            # Create mixed-color status display for late clock-in
-            mixed_record_frame = ctk.CTkFrame(status_frame, fg_color="transparent")
-            mixed_record_frame.pack(expand=True)
-            
-            # Icon and LATE in red on first line
-            first_line_frame = ctk.CTkFrame(mixed_record_frame, fg_color="transparent")
-            first_line_frame.pack()
-            
-            icon_label = ctk.CTkLabel(
-                first_line_frame,
-                text=f"{status_icon} ",
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color=status_color
-            )
-            icon_label.pack(side="left")
-            
-            late_label = ctk.CTkLabel(
-                first_line_frame,
-                text="LATE ",
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color="red"
-            )
-            late_label.pack(side="left")
-            
-            rest_label = ctk.CTkLabel(
-                first_line_frame,
-                text=f"{attendance_type} {status_text}",
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color=status_color
-            )
-            rest_label.pack(side="left")
-            
-            # Add location text if present
-            if location_text:
-                location_label = ctk.CTkLabel(
-                    mixed_record_frame,
-                    text=location_text,
-                    font=ctk.CTkFont(size=14),
-                    text_color=status_color
+        if atype == 'check' and is_out and record.get('location_name'):
+            if record_frame.location_label is None:
+                record_frame.location_label = ctk.CTkLabel(
+                    record_frame,
+                    text="",
+                    font=self._fonts[("normal", 20)],
+                    text_color="red",
+                    anchor="w"
                 )
-                location_label.pack()
-        else:
-            # Normal single-color status display
-            status_text_full = f"{status_icon} {attendance_type} {status_text}{location_text}"
-            
-            status_label = ctk.CTkLabel(
-                status_frame,
-                text=status_text_full,
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color=status_color,
-                anchor="center",
-                justify="center"
-            )
-            status_label.pack(expand=True)
-        
-        # Method section (right) - more descriptive
-        method_frame = ctk.CTkFrame(info_frame, fg_color="transparent", width=150)
-        method_frame.pack(side="right", fill="y")
-        method_frame.pack_propagate(False)
+            record_frame.location_label.configure(text=f"📍 {record['location_name']}")
+            record_frame.location_label.pack(side="left", fill="x", expand=True, pady=8)
         
-        method_label = ctk.CTkLabel(
-            method_frame,
-            text=method_text,
-            font=ctk.CTkFont(size=12),
-            text_color=("gray60", "gray"),
-            anchor="e"
-        )
-        method_label.pack(expand=True)
-    
+        return record_frame
     
     def start_camera(self):
         """Start camera"""
         print("[CAMERA DEBUG] Attempting to start camera...")
         
         # Clear any registration pause flags when user manually starts camera
-        if hasattr(self, 'main_camera_paused'):
+        if self.main_camera_paused:
             self.main_camera_paused = False
             print("[CAMERA DEBUG] Cleared registration pause flag - user manually starting camera")
         
@@ -2362,6 +2415,11 @@ class SimpleKioskApp:
             
             # Clear any cached recognition results for a fresh start
             self.face_recognition.clear_latest_results()
+            self._last_recognized_faces = []
+            self._last_distance_feedback = None
+            self._last_frame_fp = None
+            self._last_scan_result = None
+            self._recognition_future = None  # A batch from the previous session is never applied
             print("[CAMERA DEBUG] Cleared cached recognition results for fresh start")
             
             # Set camera start time to ignore immediate recognition results
@@ -2380,13 +2438,23 @@ class SimpleKioskApp:
         
         # Clear cached recognition results to prevent old results from triggering dialogs
         self.face_recognition.clear_latest_results()
+        self._last_frame_fp = None
+        self._last_scan_result = None
+        self._recognition_future = None
         print("[CAMERA DEBUG] Cleared cached recognition results")
         
+        # Forget pending display frames so the next start never flashes one from this session
+        self._display_session += 1
+        self._drop_queued_display()
+        self._display_ready = None
+        self._last_frame_sig = None
+        
         # Clear the camera display and show manual activation instructions
         self.camera_label.configure(
             image="", 
             text="📷 Camera Off\n\nPress Numpad +\nto activate camera for recognition"
         )
+        self.camera_label.image = None
         print("[CAMERA DEBUG] Camera stopped")
     
     def toggle_camera(self):
@@ -2403,11 +2471,18 @@ class SimpleKioskApp:
             self.show_success_message("📷 Camera is already active")
     
     def update_loop(self):
-        """Main update loop with comprehensive error handling"""
+        """Start the main update timers: camera frames at ~60 FPS, clock/history/focus housekeeping at 2 Hz"""
+        self._camera_tick()
+        self._ui_tick()
+    
+    def _ui_tick(self):
+        """Housekeeping update: clock label, periodic history refresh and focus check"""
         try:
-            # Update time
+            # Update time (only touch the label when the text changed)
             current_time = datetime.now().strftime("%A, %B %d, %Y - %H:%M:%S")
-            self.time_label.configure(text=current_time)
+            if current_time != self._last_time_str:
+                self.time_label.configure(text=current_time)
+                self._last_time_str = current_time
             
             # Update attendance history every 30 seconds
             current_timestamp = time.time()
@@ -2416,95 +2491,51 @@ class SimpleKioskApp:
                 self.last_history_update = current_timestamp
             
             # Check focus every 10 seconds to maintain keyboard control
-            if not hasattr(self, 'last_focus_check'):
-                self.last_focus_check = 0
             if current_timestamp - self.last_focus_check > 10:
                 self.maintain_focus()
                 self.last_focus_check = current_timestamp
             
-            # Process camera with error handling
-            if self.camera_active:
-                try:
-                    self.process_camera()
-                except Exception as cam_e:
-                    print(f"[UPDATE ERROR] Camera processing failed: {cam_e}")
-                    # Force garbage collection on camera errors
-                    import gc
-                    collected = gc.collect()
-                    print(f"[GC ERROR] Collected {collected} objects after camera error")
-            
         except Exception as e:
-            print(f"[UPDATE ERROR] Exception in main update loop: {e}")
+            logger.error("[UPDATE ERROR] Exception in UI update loop: %s", e)
             import traceback
             traceback.print_exc()
-            # Force garbage collection on any update error
-            import gc
-            collected = gc.collect()
-            print(f"[GC ERROR] Collected {collected} objects after update error")
         
         finally:
-            # Always schedule next update (16ms ≈ 60 FPS for smoother video)
+            # Always schedule next housekeeping update
             try:
-                self.root.after(16, self.update_loop)
+                self.root.after(500, self._ui_tick)
             except Exception as e:
-                print(f"[SCHEDULE ERROR] Failed to schedule next update: {e}")
-                # Try with longer delay as fallback
-                try:
-                    self.root.after(50, self.update_loop)
-                except:
-                    print("[CRITICAL ERROR] Cannot schedule updates - application may freeze")
+                logger.error("[SCHEDULE ERROR] Failed to schedule next UI update: %s", e)
     
-    def update_loop(self):
-        """Main update loop with comprehensive error handling"""
+    def _camera_tick(self):
+        """Camera update loop with comprehensive error handling"""
         try:
-            # Update time
-            current_time = datetime.now().strftime("%A, %B %d, %Y - %H:%M:%S")
-            self.time_label.configure(text=current_time)
-            
-            # Update attendance history every 30 seconds
-            current_timestamp = time.time()
-            if current_timestamp - self.last_history_update > 30:
-                self.update_attendance_history()
-                self.last_history_update = current_timestamp
-            
-            # Check focus every 10 seconds to maintain keyboard control
-            if not hasattr(self, 'last_focus_check'):
-                self.last_focus_check = 0
-            if current_timestamp - self.last_focus_check > 10:
-                self.maintain_focus()
-                self.last_focus_check = current_timestamp
-            
             # Process camera with error handling
             if self.camera_active:
                 try:
+                    # Show the frame converted since the last tick before grabbing the next one
+                    if not self.main_camera_paused:
+                        self._apply_display_frame()
                     self.process_camera()
                 except Exception as cam_e:
-                    print(f"[UPDATE ERROR] Camera processing failed: {cam_e}")
-                    # Force garbage collection on camera errors
-                    import gc
-                    collected = gc.collect()
-                    print(f"[GC ERROR] Collected {collected} objects after camera error")
+                    logger.error("[UPDATE ERROR] Camera processing failed: %s", cam_e)
             
         except Exception as e:
-            print(f"[UPDATE ERROR] Exception in main update loop: {e}")
+            logger.error("[UPDATE ERROR] Exception in main update loop: %s", e)
             import traceback
             traceback.print_exc()
-            # Force garbage collection on any update error
-            import gc
-            collected = gc.collect()
-            print(f"[GC ERROR] Collected {collected} objects after update error")
         
         finally:
             # Always schedule next update (16ms ≈ 60 FPS for smoother video)
             try:
-                self.root.after(16, self.update_loop)
+                self.root.after(16, self._camera_tick)
             except Exception as e:
-                print(f"[SCHEDULE ERROR] Failed to schedule next update: {e}")
+                logger.error("[SCHEDULE ERROR] Failed to schedule next update: %s", e)
                 # Try with longer delay as fallback
                 try:
-                    self.root.after(50, self.update_loop)
+                    self.root.after(50, self._camera_tick)
                 except:
-                    print("[CRITICAL ERROR] Cannot schedule updates - application may freeze")
+                    logger.error("[CRITICAL ERROR] Cannot schedule updates - application may freeze")
     
     def process_camera(self):
         """Process camera feed with error handling and restart capability"""
@@ -2514,276 +2545,429 @@ class SimpleKioskApp:
                 return  # Camera is OFF, no processing needed
                 
             # Check if main camera is paused (e.g., during registration)
-            if hasattr(self, 'main_camera_paused') and self.main_camera_paused:
+            if self.main_camera_paused:
                 # Debug output only once per pause to avoid spam
-                if not hasattr(self, '_pause_debug_shown') or not self._pause_debug_shown:
-                    print("[CAMERA DEBUG] Main camera processing paused for registration")
+                if not self._pause_debug_shown:
+                    logger.debug("[CAMERA DEBUG] Main camera processing paused for registration")
                     # Show paused status on camera display
                     try:
                         self.camera_label.configure(image="", text="📷 Camera Paused\n(Registration Active)")
+                        self.camera_label.image = None
                     except:
                         pass
                     self._pause_debug_shown = True
                 return  # Skip camera processing when paused
             
             # Reset debug flag when not paused
-            if hasattr(self, '_pause_debug_shown'):
-                if self._pause_debug_shown:
-                    print("[CAMERA DEBUG] Main camera processing resumed")
+            if self._pause_debug_shown:
+                logger.debug("[CAMERA DEBUG] Main camera processing resumed")
                 self._pause_debug_shown = False
             
-            # Read frame with error checking
-            frame = self.camera_manager.read_frame()
+            # Take the newest frame from the capture thread (never blocks the Tk thread)
+            frame = self.camera_manager.read_latest_frame()
             if frame is None:
+                if not self.camera_manager.capture_failed:
+                    return  # No new frame since the last tick
+                
                 # Try to restart camera if read fails multiple times
-                if not hasattr(self, 'camera_fail_count'):
-                    self.camera_fail_count = 0
                 self.camera_fail_count += 1
                 
                 if self.camera_fail_count > 30:  # 30 failed reads in a row
-                    print("[CAMERA ERROR] Multiple camera read failures, attempting restart...")
+                    logger.error("[CAMERA ERROR] Multiple camera read failures, attempting restart...")
                     self.restart_camera()
                     self.camera_fail_count = 0
                 return
             
             # Reset failure count on successful read
-            if hasattr(self, 'camera_fail_count'):
-                self.camera_fail_count = 0
+            self.camera_fail_count = 0
             
             # Resize for display - smaller to fit in the compact camera frame
             height, width = frame.shape[:2]
-            display_width = 450  # Reduced from 600 to fit better
-            display_height = int(height * display_width / width)
-            # Limit height to fit in camera frame
-            max_height = 350
-            if display_height > max_height:
-                display_height = max_height
-                display_width = int(width * display_height / height)
-            display_frame = cv2.resize(frame, (display_width, display_height))
-            
-            # Choose face detection method based on configuration
-            if self.use_ultra_light_detection:
-                # Use Ultra Light Face Detection for maximum performance
-                recognized_faces = self._process_ultra_light_detection(frame, display_frame, display_width, display_height, width, height)
+            if frame.shape != self._display_src_shape:
+                # Work out the display size (and its reusable buffer) once per camera resolution
+                display_width = 450  # Reduced from 600 to fit better
+                display_height = int(height * display_width / width)
+                # Limit height to fit in camera frame
+                max_height = 350
+                if display_height > max_height:
+                    display_height = max_height
+                    display_width = int(width * display_height / height)
+                self._display_src_shape = frame.shape
+                self._display_wh = (display_width, display_height)
+                self._display_pool.clear()
+            display_width, display_height = self._display_wh
+            
+            # Each frame gets a buffer of its own since it is handed to the display worker after the
+            # overlays are drawn; buffers come back to the pool once their image has been shown
+            display_buf = self._display_pool.pop() if self._display_pool else np.empty((display_height, display_width, 3), dtype=np.uint8)
+            if (height, width) == (display_height, display_width):
+                display_frame = display_buf
+                np.copyto(display_frame, frame)  # Already display size; copy so overlays don't touch the detection frame
+            else:
+                # INTER_AREA is the fast, alias-free choice for downscaling
+                display_frame = cv2.resize(frame, self._display_wh, dst=display_buf, interpolation=cv2.INTER_AREA)
+            
+            # Detection only runs on every Nth frame; the frames in between just redisplay the
+            # last results, since attendance is decided per scan event rather than per frame
+            self._frame_idx += 1
+            detect_now = self._frame_idx % self._detect_every_n == 0
+            if detect_now:
+                # Choose face detection method based on configuration
+                if self.use_ultra_light_detection:
+                    # Use Ultra Light Face Detection for maximum performance
+                    recognized_faces = self._process_ultra_light_detection(frame, display_frame, display_width, display_height, width, height)
+                else:
+                    # Use traditional DeepFace processing
+                    recognized_faces = self._process_deepface_detection(frame, display_frame, display_width, display_height, width, height)
+                self._last_recognized_faces = recognized_faces
             else:
-                # Use traditional DeepFace processing
-                recognized_faces = self._process_deepface_detection(frame, display_frame, display_width, display_height, width, height)
+                recognized_faces = []
+                if self._last_recognized_faces and self._last_distance_feedback:
+                    self._display_distance_feedback(display_frame, *self._last_distance_feedback)
             
             if recognized_faces:
-                print(f"[FACE DEBUG] Detected {len(recognized_faces)} face(s)")
+                logger.debug("[FACE DEBUG] Detected %s face(s)", len(recognized_faces))
         
         except Exception as e:
-            print(f"[CAMERA ERROR] Exception in camera processing: {e}")
-            # Force garbage collection on camera errors
-            import gc
-            collected = gc.collect()
-            print(f"[GC ERROR] Collected {collected} objects after camera error")
+            logger.error("[CAMERA ERROR] Exception in camera processing: %s", e)
             return
             
         # Process recognized faces for attendance
         current_time = time.time()  # Add timing for recognition logic
         
         # Ignore recognition results for first 2 seconds after camera start to prevent immediate dialog
-        if hasattr(self, 'camera_start_time') and (current_time - self.camera_start_time) < 2.0:
-            print(f"[CAMERA DEBUG] Ignoring recognition results for {2.0 - (current_time - self.camera_start_time):.1f}s after camera start")
+        if (current_time - self.camera_start_time) < 2.0:
+            logger.debug("[CAMERA DEBUG] Ignoring recognition results for %.1fs after camera start", 2.0 - (current_time - self.camera_start_time))
             return
         
+        # While a scan is being processed in the background, don't start another one
+        # (boxes are still drawn from _last_recognized_faces below)
+        if self._attendance_pending:
+            recognized_faces = []
+        
         for face in recognized_faces:
             if face['nric']:
                 # Check if personal scanning is active
-                if hasattr(self, 'personal_scanning_active') and self.personal_scanning_active:
+                if self.personal_scanning_active:
                     # Auto-fill employee ID in personal dialog
-                    if hasattr(self, 'personal_id_entry'):
+                    if self.personal_id_entry is not None:
                         try:
                             # Check if widget is still valid before using it
                             if self.personal_id_entry.winfo_exists():
                                 self.personal_id_entry.delete(0, tk.END)
                                 self.personal_id_entry.insert(0, face['nric'])
-                                print(f"[PERSONAL DEBUG] Face recognition auto-filled: {face['nric']}")
+                                logger.debug("[PERSONAL DEBUG] Face recognition auto-filled: %s", face['nric'])
                             else:
-                                print("[PERSONAL DEBUG] Personal entry widget no longer exists")
+                                logger.debug("[PERSONAL DEBUG] Personal entry widget no longer exists")
                                 self.personal_scanning_active = False  # Reset flag if widget is gone
                         except tk.TclError as e:
-                            print(f"[PERSONAL DEBUG] Error accessing personal entry widget: {e}")
+                            logger.debug("[PERSONAL DEBUG] Error accessing personal entry widget: %s", e)
                             self.personal_scanning_active = False  # Reset flag on error
                     return
                 
                 # Check if group scanning is active
-                if hasattr(self, 'group_scanning_active') and self.group_scanning_active:
+                if self.group_scanning_active:
                     # Auto-fill employee ID in group dialog
-                    if hasattr(self, 'group_current_id'):
+                    if self.group_current_id is not None:
                         try:
                             # Check if widget is still valid before using it
                             if self.group_current_id.winfo_exists():
                                 self.group_current_id.delete(0, tk.END)
                                 self.group_current_id.insert(0, face['nric'])
-                                print(f"[GROUP DEBUG] Face recognition auto-filled: {face['nric']}")
+                                logger.debug("[GROUP DEBUG] Face recognition auto-filled: %s", face['nric'])
                             else:
-                                print("[GROUP DEBUG] Group entry widget no longer exists")
+                                logger.debug("[GROUP DEBUG] Group entry widget no longer exists")
                                 self.group_scanning_active = False  # Reset flag if widget is gone
                         except tk.TclError as e:
-                            print(f"[GROUP DEBUG] Error accessing group entry widget: {e}")
+                            logger.debug("[GROUP DEBUG] Error accessing group entry widget: %s", e)
                             self.group_scanning_active = False  # Reset flag on error
                     return
                 
-                print(f"[FACE DEBUG] Recognized employee: {face['name']} ({face['nric']})")
-                employee = self.db.get_employee(face['nric'])
+                logger.debug("[FACE DEBUG] Recognized employee: %s (%s)", face['name'], face['nric'])
                 
                 # Play detection beep when face is recognized
                 self.play_scan_detected_beep()
                 
-                # Process attendance directly without confirmation
-                print(f"[FACE DEBUG] Processing attendance directly for: {face['name']}")
-                success, message = self.process_attendance_with_location_check(
-                    face['nric'], "face_recognition"
+                # Process attendance directly without confirmation, once the lookups are back
+                self._submit_attendance(
+                    face['nric'],
+                    lambda employee, today_records: self._finish_face_attendance(face, employee, today_records)
                 )
-                
-                if success:
-                    print(f"[FACE DEBUG] Attendance success: {message}")
-                    if message != "Location selection initiated":
-                        self.show_success_message(f"✓ {employee['name']} - {message}")
-                else:
-                    print(f"[FACE DEBUG] Attendance failed: {message}")
-                    
-                    # Check if this is an early clock-out error
-                    if self.is_early_clockout_error(message):
-                        self.handle_early_clockout_error(employee['name'], message)
-                    else:
-                        self.show_error_message(f"✗ {message}")
-                
                 return
             else:
-                print(f"[FACE DEBUG] Detected unknown face")
+                logger.debug("[FACE DEBUG] Detected unknown face")
         
-        # Try QR code scanning
-        detected_codes = self.barcode_scanner.scan_frame(frame)
+        # Try QR code scanning (every Nth frame)
+        scan_qr = self._frame_idx % self._qr_every_n == 0 and not self._attendance_pending
+        detected_codes = self._scan_codes(frame) if scan_qr else None
         if detected_codes and len(detected_codes) > 0:
             # Get the first detected code and extract the employee ID
             first_code = detected_codes[0]
             nric = first_code.get('data')
             
             if nric:  # Valid employee ID found
-                print(f"[DEBUG] nric is truthy: '{nric}'")
+                logger.debug("[DEBUG] nric is truthy: '%s'", nric)
                 # Check if personal scanning is active
-                if hasattr(self, 'personal_scanning_active') and self.personal_scanning_active:
-                    if hasattr(self, 'personal_id_entry'):
+                if self.personal_scanning_active:
+                    if self.personal_id_entry is not None:
                         self.personal_id_entry.delete(0, tk.END)
                         self.personal_id_entry.insert(0, nric)
-                        print(f"[PERSONAL DEBUG] QR scan auto-filled: {nric}")
+                        logger.debug("[PERSONAL DEBUG] QR scan auto-filled: %s", nric)
                     return
                 
                 # Check if group scanning is active
-                if hasattr(self, 'group_scanning_active') and self.group_scanning_active:
-                    if hasattr(self, 'group_current_id'):
+                if self.group_scanning_active:
+                    if self.group_current_id is not None:
                         self.group_current_id.delete(0, tk.END)
                         self.group_current_id.insert(0, nric)
-                        print(f"[GROUP DEBUG] QR scan auto-filled: {nric}")
+                        logger.debug("[GROUP DEBUG] QR scan auto-filled: %s", nric)
                     return
                 
-                print(f"[QR SCAN DEBUG] Detected QR/Barcode: '{nric}' from data: '{first_code.get('data')}'")
-                employee = self.db.get_employee(nric)
-                if employee:
-                    print(f"[QR SCAN DEBUG] Found employee: {employee['name']} ({employee['nric']})")
-                    
-                    # Play detection beep when QR code is recognized
-                    self.play_scan_detected_beep()
-                    
-                    # Process QR code directly without confirmation - QR codes are unique and reliable
-                    print(f"[QR SCAN DEBUG] Processing QR code directly for {employee['name']}")
-                    
-                    # Turn OFF camera after QR recognition (manual mode)
-                    self.stop_camera()
-                    print(f"[QR SCAN DEBUG] Camera turned OFF after QR recognition")
-                    
-                    # Process attendance directly
-                    success, message = self.process_attendance_with_location_check(
-                        employee['nric'], "qr_code"
-                    )
-                    
-                    if success:
-                        print(f"[QR SCAN DEBUG] Attendance success: {message}")
-                        if message != "Location selection initiated":
-                            self.show_success_message(f"✓ {employee['name']} - {message}")
-                            # Play success beep for successful attendance
-                            # self.()
-                    else:
-                        print(f"[QR SCAN DEBUG] Attendance failed: {message}")
-                        # Play error beep for failed attendance
-                        
-                        # Check if this is an early clock-out error
-                        if self.is_early_clockout_error(message):
-                            self.handle_early_clockout_error(employee['name'], message)
-                        else:
-                            self.show_error_message(f"✗ {message}")
-                else:
-                    print(f"[QR SCAN DEBUG] Employee not found in database")
-                    # Play error beep for unknown employee
-                    
-                    self.show_error_message(f"✗ Employee {nric} not found")
+                logger.debug("[QR SCAN DEBUG] Detected QR/Barcode: '%s' from data: '%s'", nric, first_code.get('data'))
+                self._submit_attendance(
+                    nric,
+                    lambda employee, today_records: self._finish_qr_attendance(nric, employee, today_records)
+                )
             else:
-                print(f"[QR SCAN DEBUG] Invalid QR code data: '{first_code.get('data')}'")
-                print(f"[DEBUG] nric is falsy: {nric}")
-                print(f"[DEBUG] First code data: '{first_code.get('data')}'")
-                print(f"[DEBUG] First code type: '{first_code.get('type')}'")
+                logger.debug("[QR SCAN DEBUG] Invalid QR code data: '%s'", first_code.get('data'))
+                logger.debug("[DEBUG] nric is falsy: %s", nric)
+                logger.debug("[DEBUG] First code data: '%s'", first_code.get('data'))
+                logger.debug("[DEBUG] First code type: '%s'", first_code.get('type'))
 
-                print(f"[DEBUG] After extract_employee_id: '{nric}'")
+                logger.debug("[DEBUG] After extract_employee_id: '%s'", nric)
                 
                 self.show_error_message(f"✗ Invalid QR code format")
             return
         else:
             # Only print this occasionally to avoid spam
-            if hasattr(self, 'debug_counter'):
-                self.debug_counter += 1
-            else:
-                self.debug_counter = 0
+            self.debug_counter += 1
             
             if self.debug_counter % 300 == 0:  # Print every 300 frames (about every 5 seconds at 60 FPS)
-                print(f"[QR SCAN DEBUG] No QR/Barcode detected in frame {self.debug_counter}")
+                logger.debug("[QR SCAN DEBUG] No QR/Barcode detected in frame %s", self.debug_counter)
         
-        # Draw face boxes if any detected
-        if recognized_faces:
-            display_frame = self.face_recognition.draw_face_boxes_from_results(display_frame, recognized_faces)
+        # Draw face boxes if any detected (from the latest detection frame)
+        if self._last_recognized_faces:
+            display_frame = self.face_recognition.draw_face_boxes_from_results(display_frame, self._last_recognized_faces, copy=False)
         else:
             # No faces detected - show positioning guidance
-            self._display_distance_feedback(display_frame, "Please position your face in the camera view", False)
+            self._display_distance_feedback(display_frame, "Please position your face in the camera view", 'bad')
         
         # Ensure display_frame is valid before color conversion
         if display_frame is None:
-            print("[CAMERA ERROR] Display frame is None")
+            logger.error("[CAMERA ERROR] Display frame is None")
+            return
+        
+        # Hand the frame to the display worker for conversion
+        self._enqueue_display(display_frame)
+    
+    def _enqueue_display(self, display_frame):
+        """Queue a frame for the display worker, dropping the one still waiting (latest wins)"""
+        # A sparse pixel sample is enough to tell a static scene (with unchanged overlays) apart;
+        # the label simply keeps showing the image it already has
+        sig = hash(display_frame[::32, ::32].tobytes())
+        if sig == self._last_frame_sig:
+            self._display_pool.append(display_frame)
             return
+        self._last_frame_sig = sig
         
-        # Convert and display frame with error handling
+        self._drop_queued_display(display_frame.shape)
+        self._display_q.put_nowait((self._display_session, display_frame))  # Only the Tk thread puts, so there is room now
+    
+    def _drop_queued_display(self, shape=None):
+        """Take back the frame still waiting for the display worker, if any"""
         try:
-            frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
-            frame_tk = ImageTk.PhotoImage(frame_pil)
-            
-            self.camera_label.configure(image=frame_tk, text="")
-            self.camera_label.image = frame_tk
+            _, stale_frame = self._display_q.get_nowait()
+            if stale_frame.shape == shape:
+                self._display_pool.append(stale_frame)
+        except queue.Empty:
+            pass
+    
+    def _display_worker(self):
+        """Convert queued display frames to PIL images on a background thread"""
+        while True:
+            session, display_frame = self._display_q.get()
+            try:
+                # Queued frames belong to the worker, so the channels are swapped in place.
+                # frombuffer still copies here (Pillow only maps modes like 'L'/'RGBA' directly)
+                frame_rgb = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB, dst=display_frame)
+                height, width = frame_rgb.shape[:2]
+                self._display_ready = (session, Image.frombuffer('RGB', (width, height), frame_rgb, 'raw', 'RGB', 0, 1), display_frame)
+            except Exception as e:
+                logger.error("[CAMERA ERROR] Failed to convert frame: %s", e)
+    
+    def _apply_display_frame(self):
+        """Show the latest converted frame; Tk images can only be created on the Tk thread"""
+        ready = self._display_ready
+        if ready is None:
+            return
+        self._display_ready = None
+        session, frame_pil, display_buf = ready
+        if session != self._display_session:
+            return  # Converted before the camera was stopped
+        
+        try:
+            # One Tk image is kept for the camera feed and new frames are pasted into it;
+            # it is only recreated when the display size changes
+            frame_tk = self._camera_photo
+            if frame_tk is None or (frame_tk.width(), frame_tk.height()) != frame_pil.size:
+                frame_tk = self._camera_photo = ImageTk.PhotoImage(frame_pil)
+            else:
+                frame_tk.paste(frame_pil)
+            # The Tk image holds its own copy of the pixels, so the buffer can be reused
+            if display_buf.shape[1::-1] == self._display_wh:
+                self._display_pool.append(display_buf)
+            
+            # Re-attach the image only when the label was showing something else
+            if self.camera_label.image is not frame_tk:
+                self.camera_label.configure(image=frame_tk, text="")
+                self.camera_label.image = frame_tk
         except Exception as e:
-            print(f"[CAMERA ERROR] Failed to display frame: {e}")
+            logger.error("[CAMERA ERROR] Failed to display frame: %s", e)
             # Show error text instead of crashing
             try:
                 self.camera_label.configure(image="", text="📷 Camera Error\nRestarting...")
+                self.camera_label.image = None
             except:
                 pass  # Ignore secondary errors
     
+    def _scan_codes(self, frame):
+        """Scan a frame for QR codes/barcodes, reusing the last result when nothing has moved"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        fingerprint = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+        if (self._last_frame_fp is not None and
+                cv2.norm(fingerprint, self._last_frame_fp, cv2.NORM_L1) < self._static_frame_threshold):
+            return self._last_scan_result
+        
+        self._last_frame_fp = fingerprint
+        self._last_scan_result = self.barcode_scanner.scan_frame(frame)
+        return self._last_scan_result
+    
+    def _submit_attendance(self, nric, on_ready):
+        """Look up an employee and today's records on the attendance worker, then call
+        on_ready(employee, today_records) back on the Tk thread"""
+        self._attendance_pending = True
+        future = self._attendance_executor.submit(self._prefetch_attendance, nric)
+        self.root.after(50, lambda: self._poll_attendance_result(future, on_ready))
+    
+    def _prefetch_attendance(self, nric):
+        """DB reads for a scan (runs on the attendance worker thread)"""
+        employee = self.db.get_employee(nric)
+        today_records = self.attendance_manager.get_employee_attendance_today(nric) if employee else None
+        return employee, today_records
+    
+    def _poll_attendance_result(self, future, on_ready):
+        """Wait for a prefetch without blocking the Tk loop, then continue on the Tk thread"""
+        if not future.done():
+            self.root.after(50, lambda: self._poll_attendance_result(future, on_ready))
+            return
+        try:
+            employee, today_records = future.result()
+            on_ready(employee, today_records)
+        except Exception as e:
+            logger.error("[ATTENDANCE ERROR] Failed to process scan: %s", e)
+            self.show_error_message("✗ Failed to process attendance")
+        finally:
+            self._attendance_pending = False
+    
+    def _finish_face_attendance(self, face, employee, today_records):
+        """Process attendance for a recognized face once its lookups are done"""
+        logger.debug("[FACE DEBUG] Processing attendance directly for: %s", face['name'])
+        success, message = self.process_attendance_with_location_check(
+            face['nric'], "face_recognition", employee, today_records
+        )
+        employee_name = employee['name'] if employee else face['name']
+        
+        if success:
+            logger.debug("[FACE DEBUG] Attendance success: %s", message)
+            if message != "Location selection initiated":
+                self.show_success_message(f"✓ {employee_name} - {message}")
+        else:
+            logger.debug("[FACE DEBUG] Attendance failed: %s", message)
+            
+            # Check if this is an early clock-out error
+            if self.is_early_clockout_error(message):
+                self.handle_early_clockout_error(employee_name, message)
+            else:
+                self.show_error_message(f"✗ {message}")
+    
+    def _finish_qr_attendance(self, nric, employee, today_records):
+        """Process attendance for a scanned QR/barcode once its lookups are done"""
+        if employee:
+            logger.debug("[QR SCAN DEBUG] Found employee: %s (%s)", employee['name'], employee['nric'])
+            
+            # Play detection beep when QR code is recognized
+            self.play_scan_detected_beep()
+            
+            # Process QR code directly without confirmation - QR codes are unique and reliable
+            logger.debug("[QR SCAN DEBUG] Processing QR code directly for %s", employee['name'])
+            
+            # Turn OFF camera after QR recognition (manual mode)
+            self.stop_camera()
+            logger.debug("[QR SCAN DEBUG] Camera turned OFF after QR recognition")
+            
+            # Process attendance directly
+            success, message = self.process_attendance_with_location_check(
+                employee['nric'], "qr_code", employee, today_records
+            )
+            
+            if success:
+                logger.debug("[QR SCAN DEBUG] Attendance success: %s", message)
+                if message != "Location selection initiated":
+                    self.show_success_message(f"✓ {employee['name']} - {message}")
+            else:
+                logger.debug("[QR SCAN DEBUG] Attendance failed: %s", message)
+                
+                # Check if this is an early clock-out error
+                if self.is_early_clockout_error(message):
+                    self.handle_early_clockout_error(employee['name'], message)
+                else:
+                    self.show_error_message(f"✗ {message}")
+        else:
+            logger.debug("[QR SCAN DEBUG] Employee not found in database")
+            
+            self.show_error_message(f"✗ Employee {nric} not found")
+    
     def quit_app(self):
         """Quit application with confirmation"""
         print("[QUIT DEBUG] Quit requested - showing confirmation")
         
-        # Create a full-screen overlay for confirmation
-        self.quit_overlay = ctk.CTkToplevel(self.root)
-        self.quit_overlay.title("Confirm Exit")
+        # The overlay is built once and only shown/hidden after that
+        if self.quit_overlay is None or not self.quit_overlay.winfo_exists():
+            self.quit_overlay = self._build_quit_overlay()
+        self.quit_overlay.deiconify()
         self.quit_overlay.attributes('-fullscreen', True)
-        self.quit_overlay.attributes('-topmost', True)
-        self.quit_overlay.configure(fg_color=("gray10", "gray10"))  # Semi-transparent dark
-        self.quit_overlay.transient(self.root)
+        self.quit_overlay.lift()
         self.quit_overlay.grab_set()
         
+        # Force UI update
+        self.root.update()
+        print("[QUIT DEBUG] Confirmation overlay displayed")
+        
+        # Temporarily change key bindings for confirmation
+        self.root.unbind('<KP_Subtract>')
+        self.root.unbind('<minus>')
+        self.root.unbind('<Return>')
+        self.root.unbind('<KP_Enter>')
+        
+        # Focus on overlay to capture keys
+        self.quit_overlay.focus_set()
+        
+        # Auto-cancel after 5 seconds
+        self._quit_after_id = self.root.after(5000, self.cancel_quit)
+    
+    def _build_quit_overlay(self):
+        """Create the (hidden) full-screen quit confirmation overlay"""
+        # Create a full-screen overlay for confirmation
+        overlay = ctk.CTkToplevel(self.root)
+        overlay.title("Confirm Exit")
+        overlay.attributes('-fullscreen', True)
+        overlay.attributes('-topmost', True)
+        overlay.configure(fg_color=("gray10", "gray10"))  # Semi-transparent dark
+        overlay.transient(self.root)
+        
         # Center the confirmation message
         confirm_frame = ctk.CTkFrame(
-            self.quit_overlay,
+            overlay,
             width=800,
             height=300,
             corner_radius=20,
@@ -2810,37 +2994,31 @@ class SimpleKioskApp:
         )
         instruction_label.pack(pady=20)
         
-        # Force UI update
-        self.root.update()
-        print("[QUIT DEBUG] Confirmation overlay displayed")
-        
-        # Temporarily change key bindings for confirmation
-        self.root.unbind('<KP_Subtract>')
-        self.root.unbind('<minus>')
-        self.root.unbind('<Return>')
-        self.root.unbind('<KP_Enter>')
-        
-        self.quit_overlay.bind('<KP_Subtract>', lambda e: self.confirm_quit())     # Numpad - to confirm
-        self.quit_overlay.bind('<minus>', lambda e: self.confirm_quit())           # Regular - to confirm
-        self.quit_overlay.bind('<Return>', lambda e: self.cancel_quit())          # Enter to cancel
-        self.quit_overlay.bind('<KP_Enter>', lambda e: self.cancel_quit())        # Numpad Enter to cancel
-        self.quit_overlay.bind('<Escape>', lambda e: self.cancel_quit())          # ESC to cancel
-        
-        # Focus on overlay to capture keys
-        self.quit_overlay.focus_set()
+        overlay.bind('<KP_Subtract>', lambda e: self.confirm_quit())     # Numpad - to confirm
+        overlay.bind('<minus>', lambda e: self.confirm_quit())           # Regular - to confirm
+        overlay.bind('<Return>', lambda e: self.cancel_quit())          # Enter to cancel
+        overlay.bind('<KP_Enter>', lambda e: self.cancel_quit())        # Numpad Enter to cancel
+        overlay.bind('<Escape>', lambda e: self.cancel_quit())          # ESC to cancel
         
-        # Auto-cancel after 5 seconds
-        self.root.after(5000, self.cancel_quit)
+        overlay.withdraw()
+        return overlay
     
     def confirm_quit(self):
         """Actually quit the application"""
         print("[QUIT DEBUG] Quit confirmed - exiting application")
+        if self._quit_after_id:
+            self.root.after_cancel(self._quit_after_id)
+            self._quit_after_id = None
         # Close the confirmation overlay
-        if hasattr(self, 'quit_overlay') and self.quit_overlay:
+        if self.quit_overlay is not None:
             self.quit_overlay.destroy()
         # Stop background face processing
         if hasattr(self, 'face_recognition') and self.face_recognition:
             self.face_recognition.stop_background_processing()
+        # Stop the scan lookup worker before the DB connection goes away
+        self._attendance_executor.shutdown(wait=False, cancel_futures=True)
+        self._recognition_executor.shutdown(wait=False, cancel_futures=True)
+        self._face_load_executor.shutdown(wait=False, cancel_futures=True)
         # Close MongoDB connection
         if hasattr(self, 'db') and self.db:
             self.db.close_connection()
@@ -2852,10 +3030,13 @@ class SimpleKioskApp:
     def cancel_quit(self):
         """Cancel the quit operation"""
         print("[QUIT DEBUG] Quit canceled - returning to normal operation")
-        # Close the confirmation overlay
-        if hasattr(self, 'quit_overlay') and self.quit_overlay:
-            self.quit_overlay.destroy()
-            self.quit_overlay = None
+        if self._quit_after_id:
+            self.root.after_cancel(self._quit_after_id)
+            self._quit_after_id = None
+        # Hide the confirmation overlay (kept for the next quit request)
+        if self.quit_overlay is not None and self.quit_overlay.winfo_exists():
+            self.quit_overlay.grab_release()
+            self.quit_overlay.withdraw()
         # Restore original key bindings
         self.setup_keyboard_shortcuts()
     
@@ -2884,11 +3065,10 @@ class SimpleKioskApp:
         center_y = (y1 + y2) / 2
         return center_x, center_y
     
-    def _calculate_face_distance(self, center1, center2, face_size):
-        """Calculate normalized distance between two face centers"""
-        import math
-        distance = math.sqrt((center1[0] - center2[0])**2 + (center1[1] - center2[1])**2)
-        return distance / face_size  # Normalize by face size
+    @staticmethod
+    def _face_cell(center_x, center_y):
+        """Grid-based face ID (50px cells) packed into an int, used to track faces across frames"""
+        return (int(center_x / 50) << 20) | int(center_y / 50)
     
     def _should_trigger_recognition(self, face_bbox, detection_confidence):
         """
@@ -2907,94 +3087,106 @@ class SimpleKioskApp:
         current_time = time.time()
         self.frame_counter += 1
         
+        # Expire faces that left the view, whether or not anything triggers
+        if self.frame_counter % 300 == 0:
+            self._cleanup_old_face_detections()
+        
         # Calculate face properties
         x1, y1, x2, y2 = face_bbox
         face_center = self._calculate_face_center(face_bbox)
         face_size = max(x2 - x1, y2 - y1)  # Use larger dimension as face size
         
         # Create face identifier based on position (for tracking across frames)
-        face_id = f"face_{int(face_center[0]/50)}_{int(face_center[1]/50)}"  # Grid-based ID
+        face_id = self._face_cell(*face_center)  # Grid-based ID
         
         # Check recognition cooldown
         if current_time - self.last_recognition_time < self.recognition_cooldown:
             return False
         
-        # Initialize or update face tracking
-        if face_id not in self.face_detection_history:
-            self.face_detection_history[face_id] = {
+        # Initialize or update face tracking. Centers and confidences live in fixed-size
+        # ring buffers (last N frames) written at count % size
+        face_data = self.face_detection_history.get(face_id)
+        if face_data is None:
+            max_history = self.face_warmup_frames * 2
+            face_data = {
                 'first_seen': self.frame_counter,
                 'last_seen': self.frame_counter,
-                'centers': [face_center],
-                'confidences': [detection_confidence],
-                'bbox_history': [face_bbox],
+                'centers': np.zeros((max_history, 2), np.float32),
+                'confidences': np.zeros(max_history, np.float32),
+                'count': 0,
                 'stable_frames': 1
             }
-            print(f"[WARMUP] New face detected: {face_id} at frame {self.frame_counter}")
+            self.face_detection_history[face_id] = face_data
+            heapq.heappush(self._face_last_seen_heap, (self.frame_counter, face_id))
+            self._record_face_sample(face_data, face_center, detection_confidence)
+            logger.debug("[WARMUP] New face detected: %s at frame %s", face_id, self.frame_counter)
             return False
         
-        face_data = self.face_detection_history[face_id]
         face_data['last_seen'] = self.frame_counter
-        face_data['centers'].append(face_center)
-        face_data['confidences'].append(detection_confidence)
-        face_data['bbox_history'].append(face_bbox)
-        
-        # Keep only recent history (last N frames)
-        max_history = self.face_warmup_frames * 2
-        if len(face_data['centers']) > max_history:
-            face_data['centers'] = face_data['centers'][-max_history:]
-            face_data['confidences'] = face_data['confidences'][-max_history:]
-            face_data['bbox_history'] = face_data['bbox_history'][-max_history:]
+        heapq.heappush(self._face_last_seen_heap, (self.frame_counter, face_id))
+        self._record_face_sample(face_data, face_center, detection_confidence)
         
         # Check if face has been stable for enough frames
         consecutive_frames = self.frame_counter - face_data['first_seen'] + 1
         
         if consecutive_frames >= self.face_warmup_frames:
-            # Check face stability (movement should be minimal)
-            recent_centers = face_data['centers'][-self.face_warmup_frames:]
-            is_stable = True
-            
-            for i in range(1, len(recent_centers)):
-                distance = self._calculate_face_distance(recent_centers[0], recent_centers[i], face_size)
-                if distance > self.face_warmup_stability_threshold:
-                    is_stable = False
-                    break
+            # Indices of the most recent samples, oldest first
+            count = face_data['count']
+            n = min(count, self.face_warmup_frames, len(face_data['confidences']))
+            recent = np.arange(count - n, count) % len(face_data['confidences'])
+            
+            max_distance, avg_confidence, min_confidence = _stability_stats(
+                face_data['centers'][recent], face_data['confidences'][recent])
+            
+            # Check face stability (movement from the oldest recent center, normalized by face size)
+            is_stable = max_distance / face_size <= self.face_warmup_stability_threshold
             
             # Check confidence stability
-            recent_confidences = face_data['confidences'][-self.face_warmup_frames:]
-            avg_confidence = sum(recent_confidences) / len(recent_confidences)
-            min_confidence = min(recent_confidences)
+            avg_confidence = float(avg_confidence)
+            min_confidence = float(min_confidence)
             
             confidence_stable = min_confidence > 0.5 and avg_confidence > 0.7
             
             if is_stable and confidence_stable:
-                print(f"[WARMUP] Face {face_id} is stable for {consecutive_frames} frames - triggering recognition")
-                print(f"[WARMUP] Average confidence: {avg_confidence:.3f}, Min confidence: {min_confidence:.3f}")
+                logger.debug("[WARMUP] Face %s is stable for %s frames - triggering recognition", face_id, consecutive_frames)
+                logger.debug("[WARMUP] Average confidence: %.3f, Min confidence: %.3f", avg_confidence, min_confidence)
                 self.last_recognition_time = current_time
                 
                 # Clean up old detections to prevent memory buildup
                 self._cleanup_old_face_detections()
                 return True
             else:
-                stability_reason = "movement" if not is_stable else "confidence"
-                print(f"[WARMUP] Face {face_id} not stable ({stability_reason}) - frames: {consecutive_frames}")
+                if _DEBUG:
+                    stability_reason = "movement" if not is_stable else "confidence"
+                    logger.debug("[WARMUP] Face %s not stable (%s) - frames: %s", face_id, stability_reason, consecutive_frames)
                 return False
         
-        print(f"[WARMUP] Face {face_id} warming up - frames: {consecutive_frames}/{self.face_warmup_frames}")
+        if _DEBUG:
+            logger.debug("[WARMUP] Face %s warming up - frames: %s/%s", face_id, consecutive_frames, self.face_warmup_frames)
         return False
     
+    @staticmethod
+    def _record_face_sample(face_data, face_center, detection_confidence):
+        """Write one frame's center and confidence into a tracked face's ring buffers"""
+        slot = face_data['count'] % len(face_data['confidences'])
+        face_data['centers'][slot] = face_center
+        face_data['confidences'][slot] = detection_confidence
+        face_data['count'] += 1
+    
     def _cleanup_old_face_detections(self):
         """Clean up old face detection history to prevent memory buildup"""
         current_frame = self.frame_counter
         cleanup_threshold = self.face_warmup_frames * 5  # Keep history for 5x warmup period
         
-        faces_to_remove = []
-        for face_id, face_data in self.face_detection_history.items():
-            if current_frame - face_data['last_seen'] > cleanup_threshold:
-                faces_to_remove.append(face_id)
-        
-        for face_id in faces_to_remove:
-            del self.face_detection_history[face_id]
-            print(f"[WARMUP] Cleaned up old face detection: {face_id}")
+        # Pop expired (last_seen, face_id) entries oldest first; an entry is stale (and just
+        # dropped) when the face was seen again later, which pushed a newer entry
+        heap = self._face_last_seen_heap
+        while heap and current_frame - heap[0][0] > cleanup_threshold:
+            last_seen, face_id = heapq.heappop(heap)
+            face_data = self.face_detection_history.get(face_id)
+            if face_data is not None and face_data['last_seen'] == last_seen:
+                del self.face_detection_history[face_id]
+                logger.debug("[WARMUP] Cleaned up old face detection: %s", face_id)
     
     def _draw_warmup_status(self, display_frame, face_bbox, face_id, frames_remaining):
         """Draw warm-up status on the display frame"""
@@ -3041,97 +3233,91 @@ class SimpleKioskApp:
                 if best_face:
                     x1, y1, x2, y2 = best_face['bbox']
                     face_coords = (x1, y1, x2 - x1, y2 - y1)  # Convert to (x, y, w, h) format
-                    is_good_distance, feedback_message = self._check_face_distance_and_provide_feedback(frame, face_coords)
+                    is_good_distance, feedback_message, quality = self._check_face_distance_and_provide_feedback(frame, face_coords)
                     
                     # Display distance feedback on the frame
-                    self._display_distance_feedback(display_frame, feedback_message, is_good_distance)
-                
-                # Draw all detected faces on display frame
-                display_faces_with_labels = []
+                    self._display_distance_feedback(display_frame, feedback_message, quality)
                 
-                for face_data in detected_faces:
+                # Run the warm-up check for every face first, then recognize all faces that
+                # passed it in one batch
+                should_recognize_flags = []
+                recognize_indices = []
+                for i, face_data in enumerate(detected_faces):
                     x1, y1, x2, y2 = face_data['bbox']
-                    confidence = face_data['confidence']
-                    
-                    # Scale coordinates to display frame
-                    display_x1 = int(x1 * display_width / width)
-                    display_y1 = int(y1 * display_height / height)
-                    display_x2 = int(x2 * display_width / width)
-                    display_y2 = int(y2 * display_height / height)
                     
                     # Extract face region for recognition
                     face_region = frame[y1:y2, x1:x2]
                     
-                    # Perform face recognition on the detected face
-                    nric = None
-                    employee_name = "Unknown"
-                    recognition_confidence = 0.0
-                    
-                    print(f"[ULTRA DEBUG] Face region size: {face_region.shape if face_region.size > 0 else 'empty'}")
-                    print(f"[ULTRA DEBUG] Bbox coordinates: ({x1}, {y1}, {x2}, {y2})")
+                    # Per face per frame: skip even the logging calls unless KIOSK_DEBUG is set
+                    if _DEBUG:
+                        logger.debug("[ULTRA DEBUG] Face region size: %s", face_region.shape if face_region.size > 0 else 'empty')
+                        logger.debug("[ULTRA DEBUG] Bbox coordinates: (%s, %s, %s, %s)", x1, y1, x2, y2)
                     
                     # Check if face recognition should be triggered (warm-up system)
-                    should_recognize = self._should_trigger_recognition(face_data['bbox'], confidence)
+                    should_recognize = self._should_trigger_recognition(face_data['bbox'], face_data['confidence'])
+                    should_recognize_flags.append(should_recognize)
                     
                     if face_region.size > 0 and face_region.shape[0] > 20 and face_region.shape[1] > 20 and should_recognize:  # Valid face region and passed warm-up
+                        recognize_indices.append(i)
+                    elif face_region.size > 0 and face_region.shape[0] > 20 and face_region.shape[1] > 20:
+                        logger.debug("[ULTRA DEBUG] Face region valid but warm-up not complete - skipping recognition")
+                    else:
+                        logger.debug("[ULTRA DEBUG] Face region too small or invalid for recognition")
+                
+                # Pick up the batch that finished since the last detection frame, then start the next one
+                recognition_results = self._collect_face_recognition(detected_faces)
+                if recognize_indices:
+                    self._submit_face_recognition(frame, detected_faces, recognize_indices)
+                
+                # Scale all boxes to display coordinates and find their centers in one pass
+                bboxes = np.array([face_data['bbox'] for face_data in detected_faces], dtype=np.float64)
+                scale = np.array([display_width / width, display_height / height] * 2)
+                display_bboxes = (bboxes * scale).astype(np.int32).tolist()
+                face_centers = ((bboxes[:, :2] + bboxes[:, 2:]) / 2).tolist()
+                
+                # Draw all detected faces on display frame
+                display_faces_with_labels = []
+                
+                for i, face_data in enumerate(detected_faces):
+                    confidence = face_data['confidence']
+                    should_recognize = should_recognize_flags[i]
+                    display_x1, display_y1, display_x2, display_y2 = display_bboxes[i]
+                    
+                    # Recognition result for this face (if it was recognized this frame)
+                    nric = None
+                    employee_name = "Unknown"
+                    recognition_confidence = 0.0
+                    
+                    if i in recognition_results:
+                        recognized_id, rec_conf = recognition_results[i]
                         try:
-                            print(f"[ULTRA DEBUG] Calling DeepFace recognition on face region...")
-                            print(f"[ULTRA DEBUG] Face region shape: {face_region.shape}")
-                            
-                            # Use DeepFace recognition on the detected face region
-                            recognized_id, rec_conf = self.face_recognition.recognize_face(face_region)
-                            print(f"[ULTRA DEBUG] DeepFace returned: ID={recognized_id}, confidence={rec_conf}")
-                            
-                            # If direct recognition fails, try with some padding around the face
-                            if not recognized_id:
-                                print(f"[ULTRA DEBUG] , trying with padded region...")
-                                
-                                # Add padding around the detected face
-                                padding = 30
-                                padded_x1 = max(0, x1 - padding)
-                                padded_y1 = max(0, y1 - padding) 
-                                padded_x2 = min(frame.shape[1], x2 + padding)
-                                padded_y2 = min(frame.shape[0], y2 + padding)
-                                
-                                padded_face_region = frame[padded_y1:padded_y2, padded_x1:padded_x2]
-                                print(f"[ULTRA DEBUG] Padded region shape: {padded_face_region.shape}")
-                                
-                                if padded_face_region.size > 0:
-                                    recognized_id, rec_conf = self.face_recognition.recognize_face(padded_face_region)
-                                    print(f"[ULTRA DEBUG] Padded recognition returned: ID={recognized_id}, confidence={rec_conf}")
-                            
                             if recognized_id:
                                 nric = recognized_id
                                 recognition_confidence = rec_conf
                                 # Get employee name from database instead of known_faces
                                 # This is more reliable as the recognition now returns NRIC not username
-                                db_employee = self.db.get_employee(nric)
+                                db_employee = self._get_cached_employee(nric)
                                 if db_employee:
                                     employee_name = db_employee.get('name', nric)
                                 else:
                                     # Employee not found in database
                                     employee_name = nric
-                                    print(f"[ULTRA RECOGNITION] NRIC {nric} not found in database")
+                                    logger.debug("[ULTRA RECOGNITION] NRIC %s not found in database", nric)
                                     # Show auto-dismiss error message
                                     self.show_auto_dismiss_error(f"❌ Employee {nric} not found in database")
-                                print(f"[ULTRA RECOGNITION] Face recognized: {employee_name} ({nric}) confidence: {rec_conf:.2f}")
+                                logger.debug("[ULTRA RECOGNITION] Face recognized: %s (%s) confidence: %.2f", employee_name, nric, rec_conf)
                             else:
-                                print(f"[ULTRA RECOGNITION] Face detected but not recognized (detection conf: {confidence:.2f})")
+                                logger.debug("[ULTRA RECOGNITION] Face detected but not recognized (detection conf: %.2f)", confidence)
                                 # Show auto-dismiss error for unrecognized face
                                 self.show_auto_dismiss_error("❌ Face not recognized\nPlease register or try again")
                         except Exception as rec_error:
-                            print(f"[ULTRA RECOGNITION] Recognition error: {rec_error}")
-                    elif face_region.size > 0 and face_region.shape[0] > 20 and face_region.shape[1] > 20:
-                        print(f"[ULTRA DEBUG] Face region valid but warm-up not complete - skipping recognition")
-                    else:
-                        print(f"[ULTRA DEBUG] Face region too small or invalid for recognition")
+                            logger.debug("[ULTRA RECOGNITION] Recognition error: %s", rec_error)
                     
                     # Create face data in format expected by main drawing system
                     is_best = best_face and face_data['id'] == best_face['id']
                     
                     # Get warm-up status for display
-                    face_center = self._calculate_face_center(face_data['bbox'])
-                    face_id = f"face_{int(face_center[0]/50)}_{int(face_center[1]/50)}"
+                    face_id = self._face_cell(*face_centers[i])
                     
                     warmup_status = ""
                     frames_remaining = self.face_warmup_frames  # Default for new faces
@@ -3182,21 +3368,101 @@ class SimpleKioskApp:
                 # For now, ultra light detection is mainly for showing real-time face detection
                 # You could add face recognition integration here if needed
             else:
+                # Consume any finished batch so it can't be matched to whoever steps in next
+                self._collect_face_recognition(detected_faces)
+                
                 # No faces detected by Ultra Light detector - show positioning guidance
-                self._display_distance_feedback(display_frame, "Please position your face in the camera view", False)
+                self._display_distance_feedback(display_frame, "Please position your face in the camera view", 'bad')
                 
         except Exception as e:
-            print(f"[ULTRA LIGHT ERROR] Detection processing failed: {e}")
+            logger.error("[ULTRA LIGHT ERROR] Detection processing failed: %s", e)
         
         return recognized_faces
     
+    def _submit_face_recognition(self, frame, detected_faces, indices):
+        """Start recognizing face regions on the recognition worker, one batch at a time"""
+        if self._recognition_future is not None:
+            # Faces that passed warm-up meanwhile are triggered again after the cooldown
+            logger.debug("[ULTRA DEBUG] Recognition still running - not starting another batch")
+            return
+        centers = {i: self._calculate_face_center(detected_faces[i]['bbox']) for i in indices}
+        future = self._recognition_executor.submit(self._recognize_face_regions, frame, detected_faces, indices)
+        # The worker stamps the finish time, so the collector can tell a fresh result from a stale one
+        future.add_done_callback(lambda f: setattr(f, 'finished_at', time.monotonic()))
+        self._recognition_future = (future, centers, time.monotonic())
+    
+    def _collect_face_recognition(self, detected_faces):
+        """Return a finished recognition batch matched to the current faces as {face index: (nric, confidence)}"""
+        if self._recognition_future is None or not self._recognition_future[0].done():
+            return {}
+        future, centers, submitted_at = self._recognition_future
+        self._recognition_future = None
+        results = future.result()  # _recognize_face_regions handles its own errors
+        
+        # A result that waited too long (e.g. no faces for a while) may belong to someone who left
+        now = time.monotonic()
+        if now - getattr(future, 'finished_at', now) > self._recognition_max_age:
+            logger.debug("[ULTRA DEBUG] Dropping stale recognition batch submitted %.2fs ago", now - submitted_at)
+            return {}
+        
+        # Faces may have moved a little since the batch was submitted, so each result goes to
+        # the nearest current face whose center is within half a face size
+        matched = {}
+        for index, result in results.items():
+            cx, cy = centers[index]
+            best_index = None
+            best_distance = None
+            for i, face_data in enumerate(detected_faces):
+                x1, y1, x2, y2 = face_data['bbox']
+                distance = ((x1 + x2) / 2 - cx) ** 2 + ((y1 + y2) / 2 - cy) ** 2
+                if distance <= (max(x2 - x1, y2 - y1) / 2) ** 2 and (best_distance is None or distance < best_distance):
+                    best_index, best_distance = i, distance
+            if best_index is None or best_index in matched:
+                logger.debug("[ULTRA DEBUG] Face left the view before recognition finished - dropping result %s", result)
+                continue
+            matched[best_index] = result
+        return matched
+    
+    def _recognize_face_regions(self, frame, detected_faces, indices):
+        """Recognize the given faces in one batch. Each face is passed once with some padding
+        around the detector box, which gives the Haar crop inside the extractor the margin it
+        needs. Returns {face index: (nric, confidence)}"""
+        if not indices:
+            return {}
+        
+        try:
+            # Add padding around the detected faces, clamped to the frame
+            padding = 30
+            frame_height, frame_width = frame.shape[:2]
+            upper = np.array([frame_width, frame_height, frame_width, frame_height])
+            padded_indices = []
+            padded_regions = []
+            for i in indices:
+                padded_box = np.array(detected_faces[i]['bbox']) + (-padding, -padding, padding, padding)
+                np.clip(padded_box, 0, upper, out=padded_box)
+                padded_x1, padded_y1, padded_x2, padded_y2 = padded_box.tolist()
+                padded_face_region = frame[padded_y1:padded_y2, padded_x1:padded_x2]
+                if padded_face_region.size > 0:
+                    padded_indices.append(i)
+                    padded_regions.append(padded_face_region)
+            
+            logger.debug("[ULTRA DEBUG] Calling DeepFace recognition on %s padded face region(s)...", len(padded_regions))
+            results = dict(zip(padded_indices, self.face_recognition.recognize_faces_batch(padded_regions)))
+            logger.debug("[ULTRA DEBUG] DeepFace returned: %s", results)
+            return results
+        except Exception as rec_error:
+            logger.debug("[ULTRA RECOGNITION] Recognition error: %s", rec_error)
+            return {}
+    
     def _process_deepface_detection(self, frame, display_frame, display_width, display_height, width, height):
         """Process frame using traditional DeepFace detection"""
         recognized_faces = []
         
         try:
             # Submit frame for background DeepFace processing (non-blocking)
-            self.face_recognition.submit_frame_for_processing(frame)
+            # The camera frame is freshly read and only drawn over via display_frame, so it is
+            # handed to the worker without a copy
+            self.face_recognition.submit_frame_for_processing(frame, copy=False)
             
             # Get latest recognition results from background thread
             face_results = self.face_recognition.get_latest_results()
@@ -3215,10 +3481,10 @@ class SimpleKioskApp:
                 if best_face:
                     x, y, w, h = best_face['position']
                     face_coords = (x, y, w, h)
-                    is_good_distance, feedback_message = self._check_face_distance_and_provide_feedback(frame, face_coords)
+                    is_good_distance, feedback_message, quality = self._check_face_distance_and_provide_feedback(frame, face_coords)
                     
                     # Display distance feedback on the frame
-                    self._display_distance_feedback(display_frame, feedback_message, is_good_distance)
+                    self._display_distance_feedback(display_frame, feedback_message, quality)
                 
                 # Convert coordinates to display frame and draw faces
                 display_faces_with_labels = []
@@ -3237,7 +3503,7 @@ class SimpleKioskApp:
                         CONFIDENCE_THRESHOLD = 0.6  # Define threshold
                         if face_confidence < CONFIDENCE_THRESHOLD:
                             # Show low confidence faces with special label
-                            print(f"[CONFIDENCE NOTICE] Low confidence detection: {face_confidence:.2f} < {CONFIDENCE_THRESHOLD}")
+                            logger.debug("[CONFIDENCE NOTICE] Low confidence detection: %.2f < %s", face_confidence, CONFIDENCE_THRESHOLD)
                             display_result = {
                                 'name': 'Low Confidence',
                                 'nric': None,
@@ -3259,16 +3525,16 @@ class SimpleKioskApp:
                             # Store recognized faces for attendance processing
                             if face['nric']:
                                 recognized_faces.append(face)
-                                print(f"[FACE DEBUG] Recognized: {face['name']} (ID: {face['nric']}, confidence: {face['confidence']:.2f})")
+                                logger.debug("[FACE DEBUG] Recognized: %s (ID: %s, confidence: %.2f)", face['name'], face['nric'], face['confidence'])
                 
                 # Draw faces with proper labels using pure DeepFace results
-                display_frame = self.face_recognition.draw_face_boxes_from_results(display_frame, display_faces_with_labels)
+                display_frame = self.face_recognition.draw_face_boxes_from_results(display_frame, display_faces_with_labels, copy=False)
             else:
                 # No faces detected by DeepFace - show positioning guidance
-                self._display_distance_feedback(display_frame, "Please position your face in the camera view", False)
+                self._display_distance_feedback(display_frame, "Please position your face in the camera view", 'bad')
         
         except Exception as e:
-            print(f"[DEEPFACE ERROR] Detection processing failed: {e}")
+            logger.error("[DEEPFACE ERROR] Detection processing failed: %s", e)
         
         return recognized_faces
     
@@ -3305,10 +3571,13 @@ class SimpleKioskApp:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
         
         # Add performance overlay
-        if hasattr(self, 'ultra_light_detector') and self.ultra_light_detector:
-            fps = self.ultra_light_detector.get_performance_stats()['fps']
-            cv2.putText(result_frame, f"Ultra Light FPS: {fps:.1f}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        if self.ultra_light_detector is not None:
+            now = time.monotonic()
+            if now - self._last_fps_draw_t > 0.5:
+                fps = self.ultra_light_detector.detector.get_fps()
+                self._fps_overlay_text = f"Ultra Light FPS: {fps:.1f}"
+                self._last_fps_draw_t = now
+            _blit_text(result_frame, self._fps_overlay_text, (10, 30), 0.7, (0, 255, 0), 2)
         
         return result_frame
     
@@ -3334,13 +3603,13 @@ class SimpleKioskApp:
     def add_employee_to_group(self, nric, employee_name):
         """Add an employee to the group check list"""
         # Check if already in list
-        for emp in self.group_employees:
-            if emp['nric'] == nric:
-                # Don't show notification here - it will be shown by the calling method
-                # to maintain consistency with other group error notifications
-                return False
+        if nric in self._group_nrics:
+            # Don't show notification here - it will be shown by the calling method
+            # to maintain consistency with other group error notifications
+            return False
         
         # Add to group
+        self._group_nrics.add(nric)
         self.group_employees.append({
             'nric': nric,
             'name': employee_name
@@ -3352,20 +3621,26 @@ class SimpleKioskApp:
         return True
     
     def update_group_display(self):
-        """Update the visual display of the group list"""
-        # Clear existing widgets in scroll frame
-        for widget in self.group_scroll_frame.winfo_children():
-            widget.destroy()
+        """Update the visual display of the group list, reusing existing rows"""
+        rows = self._group_row_widgets
         
-        # Add each employee to the display
         for i, emp in enumerate(self.group_employees):
+            text = f"{i+1}. {emp['name']} (ID: {emp['nric']})"
+            
+            if i < len(rows):
+                # Row buttons are bound to their index, so only the text changes
+                emp_label = rows[i][1]
+                if emp_label.cget("text") != text:
+                    emp_label.configure(text=text)
+                continue
+            
             emp_frame = ctk.CTkFrame(self.group_scroll_frame)
             emp_frame.pack(fill="x", padx=5, pady=2)
             
             # Employee info
             emp_label = ctk.CTkLabel(
                 emp_frame,
-                text=f"{i+1}. {emp['name']} (ID: {emp['nric']})",
+                text=text,
                 font=ctk.CTkFont(size=12),
                 anchor="w"
             )
@@ -3380,32 +3655,56 @@ class SimpleKioskApp:
                 height=25,
                 fg_color="red",
                 hover_color="darkred",
-                command=lambda idx=i: self.remove_from_group(idx)
+                command=partial(self.remove_from_group, i)
             )
             remove_btn.pack(side="right", padx=5, pady=2)
+            rows.append((emp_frame, emp_label, remove_btn))
+        
+        # Drop rows beyond the current list
+        while len(rows) > len(self.group_employees):
+            rows.pop()[0].destroy()
         
-        # Update button states
-        has_employees = len(self.group_employees) > 0
-        self.process_group_btn.configure(state="normal" if has_employees else "disabled")
+        # Update button states (kept disabled while a checkout is being recorded)
+        btn_state = "normal" if self.group_employees and not self._group_checkout_pending else "disabled"
+        if btn_state != self._group_btn_state:
+            self.process_group_btn.configure(state=btn_state)
+            self._group_btn_state = btn_state
     
     def remove_from_group(self, index):
         """Remove an employee from the group list"""
         if 0 <= index < len(self.group_employees):
+            if self.group_employees[index]['nric'] in self._group_checkout_nrics:
+                self.show_temp_message("Checkout in progress - please wait", "orange")
+                return
             removed_emp = self.group_employees.pop(index)
+            self._group_nrics.discard(removed_emp['nric'])
             self.update_group_display()
             print(f"[GROUP MODE] Removed {removed_emp['name']} from group list")
     
     def clear_group_list(self):
-        """Clear the entire group list"""
+        """Clear the entire group list (apart from employees whose checkout is still being recorded)"""
+        if self._group_checkout_pending:
+            self._remove_group_nrics(self._group_nrics - self._group_checkout_nrics)
+            return
         self.group_employees.clear()
+        self._group_nrics.clear()
         self.update_group_display()
         print("[GROUP MODE] Group list cleared")
     
+    def _remove_group_nrics(self, nrics):
+        """Remove the given employees from the group list, keeping everyone else in order"""
+        self.group_employees[:] = [emp for emp in self.group_employees if emp['nric'] not in nrics]
+        self._group_nrics.difference_update(nrics)
+        self.update_group_display()
+        print(f"[GROUP MODE] Removed {len(nrics)} employees from group list")
+    
     def process_group_checkout(self):
         """Process checkout for all employees in the group"""
         if not self.group_employees:
             self.show_temp_message("No employees in group list!", "orange")
             return
+        if self._group_checkout_pending:
+            return
         
         # Pause camera to prevent continuous face recognition during location selection
         self.pause_camera_for_popup()
@@ -3416,68 +3715,81 @@ class SimpleKioskApp:
             self.resume_camera_after_popup()
             
             if location:
-                successful_checkouts = []
-                failed_checkouts = []
-                
+                employees = list(self.group_employees)
                 current_time = self.attendance_manager.get_current_time()
                 
-                for emp in self.group_employees:
-                    nric = emp['nric']
-                    employee_name = emp['name']
-                    
-                    # Record attendance
-                    record_id = self.db.record_attendance(nric, "manual", "out", "check", current_time)
-                    
-                    if record_id:
-                        # Prepare location data for attendance record
-                        location_data = {
-                            "location_name": location.get('name', ''),
-                            "address": location.get('address', '')
-                        }
-                        
-                        # Update location for this record
-                        success = self.db.update_attendance_location(record_id, location_data)
-                        
-                        if success:
-                            successful_checkouts.append(employee_name)
-                            print(f"[GROUP CHECKOUT] Successfully checked out {employee_name} with location")
-                        else:
-                            failed_checkouts.append(employee_name)
-                            print(f"[GROUP CHECKOUT] Failed to save location for {employee_name}")
-                    else:
-                        failed_checkouts.append(employee_name)
-                        print(f"[GROUP CHECKOUT] Failed to record attendance for {employee_name}")
-                
-                # Show results
-                location_name = location.get('name', 'Selected location')
-                if successful_checkouts:
-                    if len(successful_checkouts) == 1:
-                        success_msg = f"✅ Group checkout successful!\n\n{successful_checkouts[0]} checked out at {location_name}"
-                    else:
-                        success_msg = f"✅ Group checkout successful!\n\n{len(successful_checkouts)} employees checked out at {location_name}"
-                    
-                    if failed_checkouts:
-                        success_msg += f"\n\n⚠️ Failed: {', '.join(failed_checkouts)}"
-                    
-                    self.show_success_message(success_msg)
-                else:
-                    self.show_error_message("✗ Group checkout failed for all employees")
-                
-                # Clear group list and update history
-                self.clear_group_list()
-                self.update_attendance_history()
+                # Prepare location data for attendance records
+                location_data = {
+                    "location_name": location.get('name', ''),
+                    "address": location.get('address', '')
+                }
                 
-                print(f"[GROUP CHECKOUT] Completed - Success: {len(successful_checkouts)}, Failed: {len(failed_checkouts)}")
+                # Record all checkouts, with location, in a single bulk insert on the DB worker
+                # so the network round-trip never stalls the Tk loop
+                self._group_checkout_pending = True
+                self._group_checkout_nrics = frozenset(emp['nric'] for emp in employees)
+                self.update_group_display()
+                future = self._attendance_executor.submit(
+                    self.db.record_attendance_bulk,
+                    [emp['nric'] for emp in employees],
+                    "manual", "out", "check", current_time, location_data
+                )
+                self.root.after(50, lambda: self._poll_group_checkout(future, employees, location))
             else:
                 print("[GROUP CHECKOUT] Location selection cancelled")
         
         # Open location selector dialog
-        from core.location_selector import LocationSelector
         LocationSelector(
             parent=self.root,
             nric=f"GROUP_{len(self.group_employees)}",  # Group identifier
             callback=on_location_selected
         )
+    
+    def _poll_group_checkout(self, future, employees, location):
+        """Wait for the group checkout insert without blocking the Tk loop, then show the results"""
+        if not future.done():
+            self.root.after(50, lambda: self._poll_group_checkout(future, employees, location))
+            return
+        try:
+            record_ids = future.result()
+        except Exception as e:
+            logger.error("[GROUP CHECKOUT] Bulk insert failed: %s", e)
+            record_ids = [None] * len(employees)
+        
+        successful_checkouts = []
+        failed_checkouts = []
+        for emp, record_id in zip(employees, record_ids):
+            employee_name = emp['name']
+            if record_id:
+                successful_checkouts.append(employee_name)
+                print(f"[GROUP CHECKOUT] Successfully checked out {employee_name} with location")
+            else:
+                failed_checkouts.append(employee_name)
+                print(f"[GROUP CHECKOUT] Failed to record attendance for {employee_name}")
+        
+        # Show results
+        location_name = location.get('name', 'Selected location')
+        if successful_checkouts:
+            if len(successful_checkouts) == 1:
+                success_msg = f"✅ Group checkout successful!\n\n{successful_checkouts[0]} checked out at {location_name}"
+            else:
+                success_msg = f"✅ Group checkout successful!\n\n{len(successful_checkouts)} employees checked out at {location_name}"
+            
+            if failed_checkouts:
+                success_msg += f"\n\n⚠️ Failed: {', '.join(failed_checkouts)}"
+            
+            self.show_success_message(success_msg)
+        else:
+            self.show_error_message("✗ Group checkout failed for all employees")
+        
+        # Drop the submitted employees (anyone added meanwhile stays) and update history
+        submitted = self._group_checkout_nrics
+        self._group_checkout_pending = False
+        self._group_checkout_nrics = frozenset()
+        self._remove_group_nrics(submitted)
+        self.update_attendance_history()
+        
+        print(f"[GROUP CHECKOUT] Completed - Success: {len(successful_checkouts)}, Failed: {len(failed_checkouts)}")
 
 def main():
     """Run the simple kiosk application"""